@@ -1 +1,10 @@
-from .decorators import dsv, dsv_request_meta
+from .decorators import compile_view_specs, dsv, dsv_request, dsv_request_meta
+
+try:
+    import django
+except ImportError:
+    pass
+else:
+    # Django < 3.2 doesn't find the AppConfig in apps.py by itself, later ones warn of the setting.
+    if django.VERSION < (3, 2):
+        default_app_config = 'data_spec_validator.decorator.apps.DSVConfig'
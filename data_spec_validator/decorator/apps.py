@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+from .decorators import compile_view_specs
+
+
+class DSVConfig(AppConfig):
+    """
+    Add 'data_spec_validator.decorator' to INSTALLED_APPS, so that the specs of the decorated views are compiled at
+    startup instead of on their first requests.
+    """
+
+    name = 'data_spec_validator.decorator'
+    label = 'data_spec_validator'
+    verbose_name = 'Data Spec Validator'
+
+    def ready(self):
+        if getattr(settings, 'ROOT_URLCONF', None):
+            compile_view_specs()
@@ -1,25 +1,34 @@
 import json
+import sys
+from collections.abc import Mapping
 from functools import wraps
-from typing import Dict, List, Union
-
-from data_spec_validator.spec import DSVError, raise_if, validate_data_spec
-
+from inspect import isfunction
+from typing import Dict, List, Optional, Union
+
+from data_spec_validator.spec import (
+    DSVError,
+    Source,
+    SpecJSONDecoder,
+    ValidationTimeoutError,
+    compile_spec,
+    raise_if,
+    validate_data_spec,
+)
+
+# Reported when a decorator is used, instead of when imported.
+_django_error: Optional[ModuleNotFoundError] = None
 try:
     from django.core.handlers.asgi import ASGIRequest
     from django.core.handlers.wsgi import WSGIRequest
-    from django.http import HttpResponseBadRequest, HttpResponseForbidden, QueryDict
+    from django.http import HttpResponseBadRequest, HttpResponseForbidden
+    from django.urls import get_resolver
     from django.views.generic.base import View
 except ModuleNotFoundError as e:
-    print(f'[DSV][WARNING] decorator: "dsv" cannot be used, {e}')
+    _django_error = e
 
-_enabled_drf = False
-try:
-    import rest_framework.exceptions as drf_exceptions
-    from rest_framework.request import Request
 
-    _enabled_drf = True
-except ModuleNotFoundError:
-    print('[DSV][INFO] decorator: using "dsv" without djangorestframework')
+# The specs of a decorated function, i.e. of every dsv decorator stacked on it.
+_SPECS = '__dsv_specs__'
 
 
 class ValidationError(Exception):
@@ -45,8 +54,14 @@ def _is_asgi_request(obj):
     return isinstance(obj, ASGIRequest)
 
 
+def _ensure_django():
+    raise_if(_django_error is not None, ImportError(f'[DSV] decorator: "dsv" cannot be used, {_django_error}'))
+
+
 def _is_drf_request(obj):
-    return _enabled_drf and isinstance(obj, Request)
+    # djangorestframework is not imported by the decorator, a DRF request exists only once it's imported by the app.
+    request_class = getattr(sys.modules.get('rest_framework.request'), 'Request', None)
+    return request_class is not None and isinstance(obj, request_class)
 
 
 def _is_request(obj):
@@ -57,32 +72,174 @@ def _is_view(obj):
     return issubclass(type(obj), View)
 
 
-def _combine_named_params(data, **kwargs):
-    def combine_params(_data, params):
-        raise_if(bool(set(_data.keys()) & set(params.keys())), RuntimeError('Data and URL named param have conflict'))
+class _Overlay(Mapping):
+    """
+    A read-only view of mappings stacked on each other, the first one having a key wins, e.g. the URL named params on
+    the request data. The values are read through to the mappings, nothing is copied, and the rest of the Mapping
+    methods, e.g. items() or dict(overlay), work on it as well.
+    """
+
+    __slots__ = ('_maps',)
+
+    def __init__(self, *maps):
+        self._maps = maps
+
+    def __getitem__(self, key):
+        for mapping in self._maps:
+            if key in mapping:
+                return mapping[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        for mapping in self._maps:
+            if key in mapping:
+                return mapping[key]
+        return default
+
+    def __contains__(self, key) -> bool:
+        return any(key in mapping for mapping in self._maps)
 
-        if isinstance(_data, QueryDict):
-            qd = QueryDict(mutable=True)
-            qd.update(_data)
-            qd.update(params)
-            return qd
+    def _keys(self) -> Dict:
+        return dict.fromkeys(key for mapping in self._maps for key in mapping.keys())
 
-        return {**_data, **params}
+    def __iter__(self):
+        return iter(self._keys())
 
-    # Named URL parameters should consider as params of the data spec.
+    def __len__(self) -> int:
+        return len(self._keys())
+
+
+class _QueryDictOverlay(_Overlay):
+    __slots__ = ()
+
+    def getlist(self, key, default=None):
+        # Like a QueryDict updated by the mappings, a plain mapping holds a single value per key.
+        for mapping in self._maps:
+            if key in mapping:
+                return mapping.getlist(key) if hasattr(mapping, 'getlist') else [mapping[key]]
+        return default
+
+
+def _overlay_params(data, params: Dict):
+    raise_if(any(key in data for key in params), RuntimeError('Data and URL named param have conflict'))
+    overlay_class = _QueryDictOverlay if hasattr(data, 'getlist') else _Overlay
+    return overlay_class(params, data)
+
+
+def _combine_named_params(data, **kwargs):
+    if not kwargs:
+        return data
+
+    # Named URL parameters should consider as params of the data spec, which are overlaid on the data without copying.
     if type(data) == list:
-        data = [combine_params(datum, kwargs) for datum in data]
-    else:
-        data = combine_params(data, kwargs)
-    return data
+        return [_overlay_params(datum, kwargs) for datum in data]
+    return _overlay_params(data, kwargs)
+
+
+# The headers without the HTTP_ prefix in META.
+_UNPREFIXED_HEADERS = ('CONTENT_TYPE', 'CONTENT_LENGTH')
+
 
+def _to_meta_key(name: str) -> str:
+    # e.g. X-Api-Key, x_api_key -> HTTP_X_API_KEY
+    key = name.upper().replace('-', '_')
+    return key if key.startswith('HTTP_') or key in _UNPREFIXED_HEADERS else f'HTTP_{key}'
 
-def _extract_request_meta(req, **kwargs):
+
+class _HeaderView:
+    """
+    A read-only view of META by the header names of a spec, the META keys are resolved once per spec. Only the
+    headers of the spec are its keys.
+    """
+
+    __slots__ = ('_meta', '_meta_keys')
+
+    def __init__(self, meta, meta_keys: Dict[str, str]):
+        self._meta = meta
+        self._meta_keys = meta_keys
+
+    def __getitem__(self, key):
+        return self._meta[self._meta_keys.get(key, key)]
+
+    def get(self, key, default=None):
+        return self._meta.get(self._meta_keys.get(key, key), default)
+
+    def __contains__(self, key) -> bool:
+        return self._meta_keys.get(key, key) in self._meta
+
+    def keys(self) -> List:
+        return [key for key, meta_key in self._meta_keys.items() if meta_key in self._meta]
+
+
+def _extract_request_meta(req, meta_keys: Optional[Dict[str, str]] = None, **kwargs):
     raise_if(
         not _is_wsgi_request(req) and not _is_asgi_request(req) and not _is_drf_request(req),
         RuntimeError(f'Unsupported req type, {type(req)}'),
     )
-    return _combine_named_params(req.META, **kwargs)
+    meta = req.META if meta_keys is None else _HeaderView(req.META, meta_keys)
+    return _combine_named_params(meta, **kwargs)
+
+
+def _get_dj_payload(request):
+    content_type = request.headers.get('Content-Type')
+    if content_type == 'application/json':
+        try:
+            # Decoded as a whole, the payload limits of the spec are checked by the validation afterwards.
+            return request.body and json.loads(request.body) or {}
+        except Exception:
+            raise ParseError('Unable to parse request body as JSON')
+    return request.POST
+
+
+class _SourcedData:
+    """
+    The request data read through to the source of each field, i.e. the query params, the body, the URL named params
+    or the headers, each of them is loaded on its first read and never merged. The fields without a source are read
+    from the data merged the usual way.
+    """
+
+    def __init__(self, req, sources: Dict[str, Optional[Source]], named_params: Dict):
+        self._req = req
+        self._sources = sources
+        self._named_params = named_params
+        self._loaded = {}
+
+    def _load(self, source: Optional[Source]):
+        req, is_drf_request = self._req, _is_drf_request(self._req)
+        if source == Source.QUERY:
+            return req.query_params if is_drf_request else req.GET
+        if source == Source.BODY:
+            body = req.data if is_drf_request else _get_dj_payload(req)
+            raise_if(not hasattr(body, 'get'), TypeError(f'The body must be an object, got {type(body)}'))
+            return body
+        if source == Source.PATH:
+            return self._named_params
+        if source == Source.HEADER:
+            return req.headers
+        return _extract_request_param_data(req, **self._named_params)
+
+    def _container(self, source: Optional[Source]):
+        if source not in self._loaded:
+            self._loaded[source] = self._load(source)
+        return self._loaded[source]
+
+    def get(self, key, default=None):
+        return self._container(self._sources.get(key)).get(key, default)
+
+    def getlist(self, key, default=None):
+        container = self._container(self._sources.get(key))
+        return container.getlist(key, default) if hasattr(container, 'getlist') else container.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self._container(self._sources.get(key))
+
+    def keys(self) -> List:
+        # The keys of the sources the spec reads, except the headers, which are not part of the data.
+        keys = {}
+        for source in dict.fromkeys(self._sources.values()):
+            if source != Source.HEADER:
+                keys.update(dict.fromkeys(self._container(source).keys()))
+        return list(keys)
 
 
 def _extract_request_param_data(req, **kwargs):
@@ -103,15 +260,6 @@ def _extract_request_param_data(req, **kwargs):
             # TODO: Don't care about the query_params if it's not a dict or the payload is in list.
             return req_data
 
-    def _get_dj_payload(request):
-        content_type = request.headers.get('Content-Type')
-        if content_type == 'application/json':
-            try:
-                return request.body and json.loads(request.body) or {}
-            except Exception:
-                raise ParseError('Unable to parse request body as JSON')
-        return request.POST
-
     if is_wsgi_request or is_asgi_request:
         data = _collect_data(req.method, req.GET, _get_dj_payload(req))
     else:
@@ -133,6 +281,32 @@ def _extract_request(*args):
         return req
 
 
+class _RequestLocator:
+    """
+    Find the request among the arguments of a decorated function. Where it is, i.e. the index of the argument and
+    whether it's the request of a view, is found by the first call and checked first by the following calls, which
+    pass it at the same place.
+    """
+
+    __slots__ = ('_index', '_of_view')
+
+    def __init__(self):
+        self._index: Optional[int] = None
+        self._of_view = False
+
+    def locate(self, args):
+        if self._index is not None and self._index < len(args):
+            obj = args[self._index]
+            req = getattr(obj, 'request', None) if self._of_view else obj
+            if _is_request(req):
+                return req
+
+        req = _extract_request(*args)
+        self._of_view = req is not args[0] and getattr(args[0], 'request', None) is req
+        self._index = 0 if self._of_view else next(idx for idx, obj in enumerate(args) if obj is req)
+        return req
+
+
 def _is_data_type_list(data: Union[Dict, List]) -> bool:
     return type(data) == list
 
@@ -143,13 +317,39 @@ def _eval_is_multirow(multirow: bool, data: Union[Dict, List]) -> bool:
     return multirow or _is_data_type_list(data)
 
 
+def _decode_validated_payload(req, spec, multirow, **kwargs):
+    """
+    Decode & validate the JSON body of a Django request in a single pass by SpecJSONDecoder, and return False if the
+    payload has to be extracted & validated separately instead, e.g. it's combined with the query or URL named params.
+    """
+    if kwargs or not (_is_wsgi_request(req) or _is_asgi_request(req)) or req.method == 'GET':
+        return False
+    if req.headers.get('Content-Type') != 'application/json' or not req.body:
+        return False
+
+    head = req.body.lstrip()[:1]
+    if not (head == b'{' and not multirow and not req.GET) and head != b'[':
+        return False
+    try:
+        data = json.loads(req.body, cls=SpecJSONDecoder, spec=spec, multirow=head == b'[')
+    except json.JSONDecodeError:
+        # Left to _get_dj_payload to report.
+        return False
+    # An empty payload is validated as {}, like _get_dj_payload does.
+    return bool(data)
+
+
 def _do_validate(data, spec, multirow):
+    is_multirow = _eval_is_multirow(multirow, data)
+    _raise_validation_error(validate_data_spec, data, spec, multirow=is_multirow)
+
+
+def _raise_validation_error(func, *args, **kwargs):
     # Raise exceptions with message if validation failed.
     error = None
     try:
-        is_multirow = _eval_is_multirow(multirow, data)
-        validate_data_spec(data, spec, multirow=is_multirow)
-    except ValueError as value_err:
+        return func(*args, **kwargs)
+    except (ValueError, ValidationTimeoutError) as value_err:
         error = ValidationError(str(value_err.args))
     except PermissionError as perm_err:
         error = PermissionDenied(str(perm_err.args))
@@ -166,6 +366,8 @@ def _get_error_response(error, use_drf):
     If the attribute use_drf is True, Raise DRF's exception to let DRF's exception handler do something about it.
     """
     if use_drf:
+        import rest_framework.exceptions as drf_exceptions
+
         err_map = {
             ValidationError: drf_exceptions.ValidationError,
             PermissionDenied: drf_exceptions.PermissionDenied,
@@ -181,6 +383,53 @@ def _get_error_response(error, use_drf):
     return resp_map[error.__class__](error.message)
 
 
+def _mark_specs(wrapped, func, *specs):
+    setattr(wrapped, _SPECS, getattr(func, _SPECS, ()) + tuple(spec for spec in specs if spec is not None))
+
+
+def _compile_sources(spec, multirow: bool) -> Optional[Dict[str, Optional[Source]]]:
+    # The spec is compiled when the function is decorated, the nested specs included.
+    sources = compile_spec(spec, nested=True).sources
+    raise_if(multirow and sources is not None, TypeError('The Checkers of a multirow spec cannot declare a source'))
+    return sources
+
+
+def _compile_meta_keys(meta_spec, normalize_headers: bool) -> Optional[Dict[str, str]]:
+    plan = compile_spec(meta_spec, nested=True)
+    if not normalize_headers:
+        return None
+    return {fk.data_field: _to_meta_key(fk.data_field) for fk in plan.field_keys}
+
+
+def _validate_request(req, spec, multirow, sources, meta_spec, meta_keys, kwargs):
+    """
+    Validate the data and the META of a request against their specs, either of them can be None, and return the error
+    response of the first failure, or None if both are valid.
+    """
+    use_drf = _is_drf_request(req)
+    validated = spec is None
+    try:
+        if not validated and sources is not None:
+            # Each field is read from its source, which is loaded only when a field needs it.
+            _do_validate(_SourcedData(req, sources, kwargs), spec, multirow=False)
+            validated = True
+        elif not validated:
+            validated = _raise_validation_error(_decode_validated_payload, req, spec, multirow, **kwargs)
+    except (ValidationError, PermissionDenied, ParseError) as err:
+        return _get_error_response(err, use_drf=use_drf)
+
+    data = None if validated else _extract_request_param_data(req, **kwargs)
+    meta = None if meta_spec is None else _extract_request_meta(req, meta_keys, **kwargs)
+    try:
+        if not validated:
+            _do_validate(data, spec, multirow)
+        if meta_spec is not None:
+            _do_validate(meta, meta_spec, multirow=False)
+    except (ValidationError, PermissionDenied, ParseError) as err:
+        return _get_error_response(err, use_drf=use_drf)
+    return None
+
+
 def dsv(spec, multirow=False):
     """
     Used at any function where view instance or request is the first argument.
@@ -190,38 +439,106 @@ def dsv(spec, multirow=False):
             & |CreateModelMixin.has_create_permission (NOTE: bulk_create must be False)|
     """
 
+    _ensure_django()
+    sources = _compile_sources(spec, multirow)
+
     def wrapper(func):
+        locator = _RequestLocator()
+
         @wraps(func)
         def wrapped(*args, **kwargs):
-            req = _extract_request(*args)
-            data = _extract_request_param_data(req, **kwargs)
-
-            try:
-                _do_validate(data, spec, multirow)
-            except (ValidationError, PermissionDenied, ParseError) as err:
-                return _get_error_response(err, use_drf=_is_drf_request(req))
-
-            return func(*args, **kwargs)
+            req = locator.locate(args)
+            error_response = _validate_request(req, spec, multirow, sources, None, None, kwargs)
+            return func(*args, **kwargs) if error_response is None else error_response
 
+        _mark_specs(wrapped, func, spec)
         return wrapped
 
     return wrapper
 
 
-def dsv_request_meta(spec):
+def dsv_request_meta(spec, normalize_headers=False):
+    """
+    Validate the META of the request, which is read through without copying.
+    normalize_headers: boolean, the fields are named by the headers, e.g. x_api_key or X-Api-Key for
+                       META['HTTP_X_API_KEY'], instead of the META keys
+    """
+    _ensure_django()
+    meta_keys = _compile_meta_keys(spec, normalize_headers)
+
     def wrapper(func):
+        locator = _RequestLocator()
+
         @wraps(func)
         def wrapped(*args, **kwargs):
-            req = _extract_request(*args)
-            meta = _extract_request_meta(req, **kwargs)
+            req = locator.locate(args)
+            error_response = _validate_request(req, None, False, None, spec, meta_keys, kwargs)
+            return func(*args, **kwargs) if error_response is None else error_response
 
-            try:
-                _do_validate(meta, spec, multirow=False)
-            except (ValidationError, PermissionDenied, ParseError) as err:
-                return _get_error_response(err, use_drf=_is_drf_request(req))
+        _mark_specs(wrapped, func, spec)
+        return wrapped
 
-            return func(*args, **kwargs)
+    return wrapper
+
+
+def dsv_request(spec=None, meta_spec=None, multirow=False, normalize_headers=False):
+    """
+    The combination of dsv & dsv_request_meta, which extracts the request once and validates its data against spec and
+    its META against meta_spec in a single pass, responding the first failure of them.
+    multirow: the same as dsv
+    normalize_headers: the same as dsv_request_meta
+    """
+    _ensure_django()
+    raise_if(spec is None and meta_spec is None, TypeError('dsv_request requires spec or meta_spec'))
+    sources = None if spec is None else _compile_sources(spec, multirow)
+    meta_keys = None if meta_spec is None else _compile_meta_keys(meta_spec, normalize_headers)
 
+    def wrapper(func):
+        locator = _RequestLocator()
+
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            req = locator.locate(args)
+            error_response = _validate_request(req, spec, multirow, sources, meta_spec, meta_keys, kwargs)
+            return func(*args, **kwargs) if error_response is None else error_response
+
+        _mark_specs(wrapped, func, spec, meta_spec)
         return wrapped
 
     return wrapper
+
+
+def _iter_url_callbacks(patterns):
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from _iter_url_callbacks(pattern.url_patterns)
+        elif getattr(pattern, 'callback', None) is not None:
+            yield pattern.callback
+
+
+def _iter_view_funcs(callback):
+    # The view function, or the methods of the view class (of View.as_view or a DRF view), and the functions they wrap.
+    view_class = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None)
+    funcs = [callback]
+    if view_class is not None:
+        funcs.extend(attr for attr in (getattr(view_class, name, None) for name in dir(view_class)) if isfunction(attr))
+    for func in funcs:
+        while func is not None:
+            yield func
+            func = getattr(func, '__wrapped__', None)
+
+
+def compile_view_specs(urlconf=None) -> int:
+    """
+    Compile the specs of the views in the URLconf decorated by dsv, dsv_request_meta or dsv_request, the nested specs
+    included, and return the number of them. It's called at startup by the DSV AppConfig, see apps.py.
+    urlconf: the URLconf module or its path, ROOT_URLCONF by default
+    """
+    specs = {}
+    for callback in _iter_url_callbacks(get_resolver(urlconf).url_patterns):
+        for func in _iter_view_funcs(callback):
+            specs.update(dict.fromkeys(getattr(func, _SPECS, ())))
+
+    for spec in specs:
+        compile_spec(spec, nested=True)
+    return len(specs)
@@ -1,5 +1,8 @@
-from .actions import validate_data_spec
-from .checks import Checker, CheckerOP
+from .actions import parse_data_spec, validate_data_spec
+from .adaptive import freeze_adaptive_order, get_adaptive_order
+from .checker_cache import CheckerCache, disable_checker_cache, enable_checker_cache
+from .checks import Checker, CheckerOP, Source
+from .decoder import SpecJSONDecoder
 
 # Export generic validator NAME
 from .defines import (
@@ -30,12 +33,24 @@ from .defines import (
     SELF,
     SPEC,
     STR,
+    UNION,
     UUID,
     BaseValidator,
     DSVError,
     ErrorMode,
+    LimitExceededError,
+    SpecConflictWarning,
+    UnsafePatternWarning,
+    ValidationTimeoutError,
     not_,
     reset_msg_level,
 )
 from .features import dsv_feature
+from .freeze import FreezeReport, freeze_specs
+from .patch import validate_json_patch
+from .plan import compile_spec
+from .regex_guard import analyze_pattern
+from .stream import iter_validated_rows
+from .tracking import ValidatedDict
 from .utils import raise_if
+from .validators import convert_value, get_compiled_config
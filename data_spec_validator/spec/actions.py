@@ -1,9 +1,17 @@
-from typing import List, Tuple
-
-from .defines import DSVError, ErrorMode, MsgLv, ValidateResult, get_msg_level
-from .features import get_err_mode, repack_multirow
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .defines import (
+    DSVError,
+    ErrorMode,
+    LimitExceededError,
+    MsgLv,
+    ValidateResult,
+    ValidationTimeoutError,
+    get_msg_level,
+)
+from .features import LIMIT_KEYS, MULTIROW_FIELD, ensure_limits, get_err_mode, get_limits, repack_multirow
 from .utils import raise_if
-from .validators import SpecValidator, UnknownFieldValue
+from .validators import _CONTEXT, SpecValidator, UnknownFieldValue, _ValidationContext
 
 
 def _wrap_error_with_field_info(failure) -> Exception:
@@ -18,17 +26,20 @@ def _wrap_error_with_field_info(failure) -> Exception:
 def _flatten_results(failures, errors=None):
     raise_if(type(errors) != list, RuntimeError(f'{errors} not a list'))
 
-    if type(failures) == tuple:
-        _flatten_results(failures[1], errors)
-    elif type(failures) == list:
-        for item in failures:
-            _flatten_results(item, errors)
-    elif isinstance(failures, ValidateResult):
-        if issubclass(type(failures.error), Exception):
-            error = _wrap_error_with_field_info(failures)
-            errors.append(error)
-            return
-        _flatten_results(failures.error, errors)
+    # Walk with an explicit stack, the results of deeply nested specs are as deep as the data.
+    stack = [failures]
+    while stack:
+        failures = stack.pop()
+        if type(failures) == tuple:
+            stack.append(failures[1])
+        elif type(failures) == list:
+            stack.extend(reversed(failures))
+        elif isinstance(failures, ValidateResult):
+            if issubclass(type(failures.error), Exception):
+                error = _wrap_error_with_field_info(failures)
+                errors.append(error)
+                continue
+            stack.append(failures.error)
 
 
 def _find_most_significant_error(errors: List[Exception]) -> Exception:
@@ -67,27 +78,117 @@ def _is_incorrect_multirow_spec(errors: List[Exception]) -> bool:
     return any('_InternalMultiSpec' in str(e) for e in errors)
 
 
+def _incompatible_rows_error(spec) -> ValueError:
+    return ValueError(f'spec: {spec}, reason: incompatible data format for validation, an iterable object is needed')
+
+
 def _extract_error(spec, failures: List[Tuple[bool, List[ValidateResult]]]) -> Exception:
     errors = []
     _flatten_results(failures, errors)
     err_mode = get_err_mode(spec)
 
     if _is_incorrect_multirow_spec(errors):
-        msg = f'spec: {spec}, reason: incompatible data format for validation, an iterable object is needed'
-        return ValueError(msg)
+        return _incompatible_rows_error(spec)
 
     if err_mode == ErrorMode.MSE:
         return _find_most_significant_error(errors)
     return DSVError(*errors)
 
 
-def validate_data_spec(data, spec, **kwargs) -> bool:
-    # SPEC validator as the root validator
-    (_data, _spec) = repack_multirow(data, spec) if kwargs.get('multirow', False) else (data, spec)
-    ok, failures = SpecValidator.validate(_data, {SpecValidator.name: _spec}, None)
+def _limit_rows(rows: Iterable, max_rows: int) -> Iterable:
+    for idx, row in enumerate(rows):
+        if idx >= max_rows:
+            raise LimitExceededError(f'reason: number of rows exceeds max_rows({max_rows})')
+        yield row
+
+
+def _build_context(data, spec, is_multirow: bool, kwargs, parsing: bool) -> Tuple[object, _ValidationContext]:
+    # The limits of validate_data_spec take precedence over the ones of the spec.
+    call_limits = {key: kwargs[key] for key in LIMIT_KEYS if key in kwargs}
+    ensure_limits(call_limits)
+    limits = {**get_limits(spec), **call_limits}
+
+    max_depth = limits.get('max_depth')
+    rows = None
+    if is_multirow:
+        if max_depth is not None:
+            # The internal multirow spec takes a level.
+            max_depth += 1
+
+        max_rows = limits.get('max_rows')
+        if max_rows is not None:
+            if hasattr(data, '__len__'):
+                raise_if(
+                    len(data) > max_rows,
+                    LimitExceededError(f'reason: number of rows({len(data)}) exceeds max_rows({max_rows})'),
+                )
+            else:
+                data = _limit_rows(data, max_rows)
+        rows = data
+
+    ctx = _ValidationContext(
+        max_depth=max_depth,
+        max_list_length=limits.get('max_list_length'),
+        max_str_size=limits.get('max_str_size'),
+        rows=rows,
+        deadline=limits.get('deadline'),
+        parsing=parsing,
+        # The root spec, or the spec of the rows, which is nested in the internal multirow spec.
+        partial_depth=(1 if is_multirow else 0) if kwargs.get('partial', False) else None,
+    )
+    return data, ctx
+
+
+def _validate(data, spec, kwargs: Dict, parsing: bool) -> Tuple[bool, Any]:
+    is_multirow = kwargs.get('multirow', False)
     nothrow = kwargs.get('nothrow', False)
 
+    try:
+        data, ctx = _build_context(data, spec, is_multirow, kwargs, parsing)
+        # SPEC validator as the root validator
+        (_data, _spec) = repack_multirow(data, spec) if is_multirow else (data, spec)
+        ok, failures = SpecValidator.validate(_data, {SpecValidator.name: _spec, _CONTEXT: ctx}, None)
+    except (LimitExceededError, ValidationTimeoutError):
+        if nothrow:
+            return False, None
+        raise
+
     if not ok and not nothrow:
         error = _extract_error(spec, failures)
         raise error
+    if not ok or not parsing:
+        return ok, None
+    return ok, ctx.parsed[MULTIROW_FIELD] if is_multirow else ctx.parsed
+
+
+def validate_data_spec(data, spec, **kwargs) -> bool:
+    """
+    kwargs:
+        multirow: boolean, validate each element of data against the spec
+        nothrow: boolean, return False instead of raising an error when the validation fails
+        partial: boolean, validate only the fields present in data (of the rows, for multirow), as if all the Checkers
+                 of the spec were optional, any_keys_set is not checked either, e.g. for PATCH requests
+
+        The payload limits below default to the ones of dsv_feature(limits=...), a LimitExceededError is raised
+        immediately when one of them is exceeded, the sizes known up front are checked before any traversal.
+        max_rows: int or None, the maximum number of rows in multirow data
+        max_list_length: int or None, the maximum length of a LIST_OF/FOREACH value
+        max_depth: int or None, the maximum nesting depth of specs
+        max_str_size: int or None, the maximum size of a str/bytes value
+        deadline: float or None, the time budget in seconds, the clock is checked between fields & elements, and a
+                  ValidationTimeoutError is raised once the budget is spent
+    """
+    ok, _ = _validate(data, spec, kwargs, parsing=False)
     return ok
+
+
+def parse_data_spec(data, spec, **kwargs) -> Any:
+    """
+    Validate the data like validate_data_spec, and return the parsed data in the same traversal, i.e. a dict keyed by
+    the spec field names (a list of them for multirow), with the values converted by their checks, e.g. a date for
+    DATE. Absent optional fields and the fields not in the spec are left out. None is returned instead when the
+    validation fails and nothrow is True.
+    kwargs: the same as validate_data_spec
+    """
+    _, parsed = _validate(data, spec, kwargs, parsing=True)
+    return parsed
@@ -0,0 +1,129 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .utils import raise_if
+
+# Learned orders are recomputed once per this many validations of a spec.
+_REORDER_INTERVAL = 100
+
+ADAPTIVE_ORDER_TYPE = List[Tuple[str, Tuple[str, ...]]]
+
+
+class _Stat:
+    __slots__ = ('runs', 'failures', 'elapsed')
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.elapsed = 0.0
+
+    def record(self, ok: bool, elapsed: float):
+        self.runs += 1
+        self.failures += 0 if ok else 1
+        self.elapsed += elapsed
+
+    def score(self, for_failure: bool = True) -> float:
+        # Laplace-smoothed probability divided by the average cost, the classic ordering rule for a sequence of
+        # short-circuiting tests: the larger the score, the earlier the test should run.
+        fail_rate = (self.failures + 1) / (self.runs + 2)
+        prob = fail_rate if for_failure else 1 - fail_rate
+        avg_cost = self.elapsed / self.runs if self.runs else 0.0
+        return prob / max(avg_cost, 1e-9)
+
+
+class AdaptiveStats:
+    """
+    Failure rates and costs observed for the fields and checks of one spec.
+
+    The stats are updated without locking, concurrent validations may lose a few samples, which only affects how
+    fast the order converges.
+    """
+
+    def __init__(self):
+        self._field_stats: Dict[str, _Stat] = {}
+        self._check_stats: Dict[Tuple[str, str], _Stat] = {}
+        self._field_order: Tuple[str, ...] = ()
+        self._check_orders: Dict[str, Tuple[str, ...]] = {}
+        self._op_any_fields = set()
+        self._frozen = False
+        self._validations = 0
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def record_field(self, field: str, ok: bool, elapsed: float):
+        if not self._frozen:
+            self._field_stats.setdefault(field, _Stat()).record(ok, elapsed)
+
+    def record_check(self, field: str, check: str, ok: bool, elapsed: float):
+        if not self._frozen:
+            self._check_stats.setdefault((field, check), _Stat()).record(ok, elapsed)
+
+    def tick(self):
+        if self._frozen:
+            return
+        self._validations += 1
+        if self._validations % _REORDER_INTERVAL == 0:
+            self._reorder()
+
+    def _reorder(self):
+        fields = sorted(self._field_stats.items(), key=lambda kv: kv[1].score(), reverse=True)
+        self._field_order = tuple(f for f, _ in fields)
+
+        per_field: Dict[str, List[Tuple[str, _Stat]]] = {}
+        for (field, check), stat in self._check_stats.items():
+            per_field.setdefault(field, []).append((check, stat))
+        self._check_orders = {}
+        for field, items in per_field.items():
+            # Under CheckerOP.ANY the first passing check decides, so the most likely passing check goes first.
+            for_failure = field not in self._op_any_fields
+            ordered = sorted(items, key=lambda kv: kv[1].score(for_failure), reverse=True)
+            self._check_orders[field] = tuple(c for c, _ in ordered)
+
+    @staticmethod
+    def _apply_order(learned: Sequence[str], items: Iterable, key=lambda item: item) -> list:
+        rank = {name: idx for idx, name in enumerate(learned)}
+        # Unseen items keep their declared order, after the ranked ones.
+        return sorted(items, key=lambda item: rank.get(key(item), len(rank)))
+
+    def order_fields(self, field_keys: list) -> list:
+        return self._apply_order(self._field_order, field_keys, key=lambda fk: fk.spec_field)
+
+    def order_checks(self, field: str, checks: Iterable[str], op_any: bool) -> List[str]:
+        if op_any:
+            self._op_any_fields.add(field)
+        return self._apply_order(self._check_orders.get(field, ()), dict.fromkeys(checks))
+
+    def export_order(self) -> ADAPTIVE_ORDER_TYPE:
+        fields = list(self._field_order) + [f for f in self._check_orders if f not in self._field_order]
+        return [(f, self._check_orders.get(f, ())) for f in fields]
+
+    def freeze(self, order: Optional[ADAPTIVE_ORDER_TYPE] = None):
+        if order is not None:
+            self._field_order = tuple(field for field, _ in order)
+            self._check_orders = {field: tuple(checks) for field, checks in order if checks}
+        self._frozen = True
+
+
+def _get_stats(spec) -> AdaptiveStats:
+    from .features import get_adaptive_stats
+
+    stats = get_adaptive_stats(spec)
+    raise_if(stats is None, TypeError(f'{spec} is not decorated with dsv_feature(adaptive=True)'))
+    return stats
+
+
+def get_adaptive_order(spec) -> ADAPTIVE_ORDER_TYPE:
+    """
+    Return the learned evaluation order of an adaptive spec, i.e. [(field, (check, ...)), ...].
+    Fields and checks which are not listed are evaluated in declared order after the listed ones.
+    """
+    return _get_stats(spec).export_order()
+
+
+def freeze_adaptive_order(spec, order: Optional[ADAPTIVE_ORDER_TYPE] = None):
+    """
+    Stop learning and keep evaluating an adaptive spec in a fixed order.
+    The order defaults to the currently learned one, pass an order from get_adaptive_order to restore it.
+    """
+    _get_stats(spec).freeze(order)
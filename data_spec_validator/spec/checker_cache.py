@@ -0,0 +1,136 @@
+import atexit
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from data_spec_validator.__version__ import __version__
+
+from .checks import _COMPILED, Checker, _get_checker_cache, _set_checker_cache
+from .custom_spec.defines import get_custom_check_2_validator_map
+
+
+def _fingerprint() -> Tuple:
+    # The built Checkers depend on the library, and the pickles of them on the Python version.
+    return __version__, sys.version_info[:2]
+
+
+def _registry_token() -> Tuple:
+    # The custom checks registered, which the extra of a Checker depends on.
+    return tuple(
+        sorted(
+            (check, f'{type(validator).__module__}.{type(validator).__qualname__}')
+            for check, validator in get_custom_check_2_validator_map().items()
+        )
+    )
+
+
+class CheckerCache:
+    """
+    An on-disk cache of the built Checkers, i.e. their checks & extra with the compiled configurations, keyed by their
+    whole configuration like the identical Checkers are, so an entry is reused by any spec declaring the same Checker.
+    The file is invalidated once the library or the Python version changes, and the entries depend on the custom
+    checks registered as well. Only the Checkers of plain values are cached, e.g. not the ones with a SPEC class, nor
+    the ones of a custom check compiling its configuration. The warnings of building a Checker, e.g.
+    UnsafePatternWarning, are not raised again by a cached one, like the warnings of compiling a module by its .pyc.
+    The cache file must be trusted, it's a pickle.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        # The pickled (checks, extra) of the Checkers by the registered custom checks & the configurations.
+        self._states: Dict[Tuple, Dict[Tuple, bytes]] = {}
+        self._token: Optional[Tuple] = None
+        self._new: List[Tuple[Tuple, Tuple, Checker]] = []
+        self._load()
+
+    def _load(self):
+        import pickle
+
+        try:
+            with open(self.cache_path, 'rb') as f:
+                fingerprint, states = pickle.load(f)
+            if fingerprint == _fingerprint() and type(states) == dict:
+                self._states = states
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+            # A missing or broken file is written again.
+            pass
+
+    def _registry_states(self) -> Dict[Tuple, bytes]:
+        if self._token is None:
+            self._token = _registry_token()
+        return self._states.setdefault(self._token, {})
+
+    def registry_changed(self):
+        self._token = None
+
+    def get(self, key: Tuple) -> Optional[Tuple[Tuple[str, ...], Dict]]:
+        data = self._registry_states().get(key)
+        if data is None:
+            return None
+        import pickle
+
+        try:
+            checks, extra = pickle.loads(data)
+        except Exception:
+            # An entry which can't be loaded any more, e.g. of a removed class, is built again.
+            return None
+        return (checks, extra) if type(checks) == tuple and type(extra) == dict else None
+
+    def put(self, key: Tuple, checker: Checker):
+        custom_map = get_custom_check_2_validator_map()
+        if any(check in custom_map for check in checker.extra.get(_COMPILED, ())):
+            # Compiled by the code of the project, which may change without the cache knowing.
+            return
+        self._registry_states()
+        self._new.append((self._token, key, checker))
+
+    def save(self) -> int:
+        """
+        Write the cache file with the newly built Checkers, and return the number of them.
+        """
+        if not self._new:
+            return 0
+        import pickle
+        import tempfile
+
+        written = 0
+        for token, key, checker in self._new:
+            try:
+                data = pickle.dumps((checker.checks, dict(checker.extra)), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # A configuration compiled into an object which can't be pickled is built every time.
+                continue
+            self._states.setdefault(token, {})[key] = data
+            written += 1
+        self._new.clear()
+
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written to a temporary file then renamed, so that a concurrent process never reads a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((_fingerprint(), self._states), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+        return written
+
+
+def enable_checker_cache(cache_path: str, save_at_exit: bool = True) -> CheckerCache:
+    """
+    Load the built Checkers from, and save them to, the cache file, enabled before the specs are defined, i.e. before
+    the modules of the specs are imported.
+    save_at_exit: boolean, save the newly built Checkers when the process exits
+    """
+    disable_checker_cache()
+    cache = CheckerCache(cache_path)
+    _set_checker_cache(cache)
+    if save_at_exit:
+        atexit.register(cache.save)
+    return cache
+
+
+def disable_checker_cache():
+    # The Checkers built already are kept by their specs.
+    cache = _get_checker_cache()
+    if cache is not None:
+        atexit.unregister(cache.save)
+    _set_checker_cache(None)
@@ -1,9 +1,11 @@
 import copy
 import functools
+import marshal
+import weakref
 from enum import Enum
 from functools import lru_cache, reduce
-from inspect import isclass
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Type, Union
 
 from .defines import (
     AMOUNT,
@@ -33,6 +35,7 @@ from .defines import (
     REGEX,
     SPEC,
     STR,
+    UNION,
     UUID,
     BaseValidator,
     BaseWrapper,
@@ -41,6 +44,13 @@ from .defines import (
 from .utils import raise_if
 
 _TYPE = '_type_'
+# The configurations compiled by the validators, keyed by check.
+_COMPILED = '_compiled_'
+
+
+def _isclass(obj) -> bool:
+    # inspect.isclass, without importing inspect.
+    return isinstance(obj, type)
 
 
 @lru_cache(1)
@@ -73,6 +83,7 @@ def _get_default_check_2_validator_map() -> Dict[str, BaseValidator]:
         SpecValidator,
         StrValidator,
         TypeValidator,
+        UnionValidator,
         UUIDValidator,
     )
 
@@ -102,6 +113,7 @@ def _get_default_check_2_validator_map() -> Dict[str, BaseValidator]:
         EMAIL: EmailValidator(),
         UUID: UUIDValidator(),
         REGEX: RegexValidator(),
+        UNION: UnionValidator(),
         COND_EXIST: CondExistValidator(),
         FOREACH: ForeachValidator(),
         _TYPE: TypeValidator(),
@@ -125,7 +137,37 @@ def _get_check_2_validator_map() -> Dict[str, BaseValidator]:
     return validator_map
 
 
+def get_compiled_config(extra: Dict, validator) -> Any:
+    """
+    Return the configuration of the validator compiled by its compile_config, which is done when the Checker is built,
+    or right now for an extra not built by a Checker.
+    """
+    compiled = extra.get(_COMPILED)
+    if compiled is not None and validator.name in compiled:
+        return compiled[validator.name]
+    return validator.compile_config(extra.get(validator.name))
+
+
+# The validators resolved by get_validator, cleared when custom validators are registered.
+_resolved_validators: Dict[str, Union[BaseValidator, BaseWrapper]] = {}
+
+
+def clear_resolved_validators():
+    _resolved_validators.clear()
+    # The extra of a Checker depends on the registered checks as well.
+    _interned_checkers.clear()
+    if _checker_cache is not None:
+        _checker_cache.registry_changed()
+
+
 def get_validator(check: str) -> Union[BaseValidator, BaseWrapper]:
+    validator = _resolved_validators.get(check)
+    if validator is None:
+        validator = _resolved_validators[check] = _resolve_validator(check)
+    return validator
+
+
+def _resolve_validator(check: str) -> Union[BaseValidator, BaseWrapper]:
     validator_map = _get_check_2_validator_map()
 
     found_idx = check.find(_wrapper_splitter)
@@ -145,14 +187,80 @@ class CheckerOP(Enum):
     ANY = 'any'
 
 
+class Source(Enum):
+    # Where the dsv decorator reads a field from.
+    QUERY = 'query'
+    BODY = 'body'
+    PATH = 'path'
+    HEADER = 'header'
+
+
+# The leaf values of the Checker configurations which are interned, compared by their types & values.
+_INTERNED_VALUE_TYPES = (str, int, bool, bytes, type(None))
+# The Checkers built, by their configurations, which are shared by the identical ones.
+_interned_checkers: 'weakref.WeakValueDictionary[Hashable, Checker]' = weakref.WeakValueDictionary()
+# The tuples of checks, shared by the Checkers of the same checks.
+_interned_checks: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+# The on-disk cache of the built Checkers, see checker_cache.py.
+_checker_cache = None
+
+
+def _get_checker_cache():
+    return _checker_cache
+
+
+def _set_checker_cache(cache):
+    global _checker_cache
+    _checker_cache = cache
+
+
+def _freeze_config(value) -> Hashable:
+    # A hashable key of a configuration, distinguishing the values which are equal but validated differently, e.g. 1,
+    # True & 1.0. A value of any other type, e.g. a compiled pattern, can't be keyed, and raises TypeError.
+    value_type = type(value)
+    if value_type in _INTERNED_VALUE_TYPES:
+        return value_type, value
+    if value_type is float:
+        return float, repr(value)
+    if value_type in (list, tuple):
+        return value_type, tuple(_freeze_config(v) for v in value)
+    if value_type is dict:
+        return dict, tuple((_freeze_config(k), _freeze_config(v)) for k, v in value.items())
+    if isinstance(value, (type, Enum)):
+        # Compared by identity, the Checker keeps it alive.
+        return value_type, id(value), value
+    raise TypeError(f'{value_type} is not interned')
+
+
+def _is_plain_key(key: Tuple) -> bool:
+    # Whether a key of a Checker, without the class, is made of the values kept by the on-disk cache, e.g. no class.
+    checks, optional_type, _, allow_none_type, _, op, alias, source = key[:8]
+    return (
+        optional_type is bool
+        and allow_none_type is bool
+        and type(op) is CheckerOP
+        and (alias is None or type(alias) is str)
+        and (source is None or type(source) is Source)
+        and all(type(check) is str for check in checks)
+    )
+
+
 class Checker:
-    def __init__(
-        self,
+    """
+    The Checkers are immutable, and the ones built by identical configurations are the same object, shared by the
+    specs. Their checks are a tuple and their extra a read-only mapping.
+    """
+
+    __slots__ = ('checks', 'extra', '_op', '_optional', '_allow_none', '_alias', '_source', '__weakref__')
+
+    def __new__(
+        cls,
         raw_checks: List[RAW_CHECK_TYPE],
         optional: bool = False,
         allow_none: bool = False,
         op: CheckerOP = CheckerOP.ALL,
         alias: Optional[str] = None,
+        source: Optional[Source] = None,
         **kwargs,
     ):
         """
@@ -164,28 +272,87 @@ class Checker:
         op: CheckerOP
         alias: str or None
                A string that represents the field name which will be used when extracting values from data payload
+        source: Source or None
+               Where the dsv decorator reads the field from, i.e. the query params, the body, the URL named params or
+               the headers, instead of the data merged from them
         kwargs: dict
         """
-        self.checks, class_check_type = self._sanitize_checks(raw_checks)
+        # Built here without an __init__, which would run again on an interned Checker.
+        try:
+            # The checks are str or classes, which are never equal to each other.
+            key = (cls, tuple(raw_checks), type(optional), optional, type(allow_none), allow_none, op, alias, source)
+            plain = True
+            if kwargs:
+                try:
+                    # Much faster than _freeze_config, and keeps the types apart as well, but takes no class or Enum.
+                    key += (marshal.dumps(kwargs, 2),)
+                except ValueError:
+                    key += (_freeze_config(kwargs),)
+                    plain = False
+            checker = _interned_checkers.get(key)
+        except TypeError:
+            key = checker = None
+        if checker is None:
+            checker = super().__new__(cls)
+            # Only the configurations of plain values are in the on-disk cache, keyed without the class.
+            cache_key = None
+            if _checker_cache is not None and key is not None and plain and cls is Checker and _is_plain_key(key[1:]):
+                cache_key = key[1:]
+            state = _checker_cache.get(cache_key) if cache_key is not None else None
+            if state is not None:
+                checker._restore(state, optional, allow_none, op, alias, source)
+            else:
+                checker._build(raw_checks, optional, allow_none, op, alias, source, kwargs)
+                if cache_key is not None:
+                    _checker_cache.put(cache_key, checker)
+            if key is not None:
+                _interned_checkers[key] = checker
+        return checker
+
+    def _build(self, raw_checks, optional, allow_none, op, alias, source, kwargs):
+        checks, class_check_type = self._sanitize_checks(raw_checks)
+        self.checks = _interned_checks.setdefault(tuple(checks), tuple(checks))
 
         self._op = op
         self._optional = optional
         self._allow_none = allow_none
         self._alias = alias
+        self._source = source
 
         self._ensure(kwargs)
-        self.extra = self._build_extra(class_check_type, kwargs)
+        extra = self._build_extra(class_check_type, kwargs)
+        compiled = self._compile_configs(self.checks, extra)
+        if compiled:
+            extra[_COMPILED] = compiled
+        self.extra = MappingProxyType(extra)
+
+    def _restore(self, state, optional, allow_none, op, alias, source):
+        # Restore a Checker built by an identical configuration, which is loaded from the on-disk cache.
+        checks, extra = state
+        self.checks = _interned_checks.setdefault(checks, checks)
+        self._op = op
+        self._optional = optional
+        self._allow_none = allow_none
+        self._alias = alias
+        self._source = source
+        self.extra = MappingProxyType(extra)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     @staticmethod
     def _sanitize_checks(raw_checks: List[RAW_CHECK_TYPE]) -> Tuple[List[str], Optional[Type[Any]]]:
         class_type_check = None
 
         def _is_checkable(elem: Any) -> bool:
-            return isclass(elem) or type(elem) is str
+            return _isclass(elem) or type(elem) is str
 
         def _purify_check(rc: RAW_CHECK_TYPE) -> Union[str, Type[Any]]:
             nonlocal class_type_check
-            if isclass(rc):
+            if _isclass(rc):
                 raise_if(not _is_checkable(rc), TypeError(f'A qualified CHECK is required, but got {rc}'))
                 class_type_check = rc
                 return _TYPE
@@ -212,7 +379,7 @@ class Checker:
         extra = copy.deepcopy(temp)
         for arg_k, arg_v in temp.items():
             if arg_k in {LIST_OF, FOREACH}:
-                if isclass(arg_v) and _TYPE not in extra:
+                if _isclass(arg_v) and _TYPE not in extra:
                     extra.update({arg_k: _TYPE})
                     extra.update({_TYPE: arg_v})
         return extra
@@ -237,10 +404,27 @@ class Checker:
         raise_if(
             self._optional and len(self.checks) == 0, ValueError('Require at least 1 check when set optional=True')
         )
+        raise_if(
+            self._source is not None and not isinstance(self._source, Source),
+            TypeError(f'A Source is required, but got {self._source!r}'),
+        )
 
         __ensure_upper_case(check_kwargs)
         __ensure_no_repeated_forbidden(check_kwargs)
 
+    @staticmethod
+    def _compile_configs(checks: Tuple[str, ...], extra: Dict[str, Any]) -> Dict[str, Any]:
+        validator_map = _get_check_2_validator_map()
+        compiled = {}
+        # Each listed check is compiled even without its configuration, e.g. [LENGTH] raises here instead of when a
+        # value is validated, so are the configurations given to a check not listed.
+        listed = [check[check.find(_wrapper_splitter) + 1 :] for check in checks]
+        for key in dict.fromkeys([*listed, *extra.keys()]):
+            validator = validator_map.get(key)
+            if validator is not None and type(validator).compile_config is not BaseValidator.compile_config:
+                compiled[key] = validator.compile_config(extra.get(key))
+        return compiled
+
     @property
     def allow_none(self) -> bool:
         return self._allow_none
@@ -260,3 +444,7 @@ class Checker:
     @property
     def alias(self) -> str:
         return self._alias
+
+    @property
+    def source(self) -> Optional[Source]:
+        return self._source
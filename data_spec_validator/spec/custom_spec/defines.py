@@ -26,4 +26,8 @@ def register(check_2_validator_map) -> bool:
                 f'{_get_class_name(ori_validator)} to {_get_class_name(validator)}'
             )
         _custom_map[check] = validator
+
+    from data_spec_validator.spec.checks import clear_resolved_validators
+
+    clear_resolved_validators()
     return True
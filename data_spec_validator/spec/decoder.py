@@ -0,0 +1,184 @@
+import json
+from json.decoder import WHITESPACE, JSONDecodeError, scanstring
+from typing import Any, Dict, Generator, Optional, Set, Tuple
+
+from .actions import _build_context, _extract_error, validate_data_spec
+from .checks import COND_EXIST, SPEC, Checker
+from .defines import LimitExceededError
+from .features import get_limits
+from .patch import _nested_spec
+from .plan import SpecPlan, compile_spec
+from .utils import raise_if
+from .validators import _iter_validate_spec, _run_task, _ValidationContext
+
+_WS = ' \t\n\r'
+
+
+class SpecJSONDecoder(json.JSONDecoder):
+    """
+    A JSON decoder validating the objects against a spec while decoding, i.e. json.loads(s, cls=SpecJSONDecoder,
+    spec=Spec), in a single pass over the data. An object is validated as soon as it closes, and the first invalid
+    one raises the error validate_data_spec would raise, before the rest of the document is decoded.
+
+    The objects of nested SPEC & LIST_OF/FOREACH fields are validated when they close, and their fields are not
+    traversed again by the enclosing object. The nested objects are descended into as sub-tasks, like the validation
+    does, without growing the Python stack. The scalars & the other values are decoded by the C scanner of json.
+
+    multirow: validate each element of a top-level array against the spec, None to tell it by the document.
+    """
+
+    def __init__(self, *, spec, multirow: Optional[bool] = False, **kwargs):
+        raise_if(
+            kwargs.get('object_hook') or kwargs.get('object_pairs_hook'),
+            TypeError('SpecJSONDecoder does not support object_hook & object_pairs_hook'),
+        )
+        super().__init__(**kwargs)
+        self.spec = spec
+        self.multirow = multirow
+        self._ctx: Optional[_ValidationContext] = None
+        self._descending: Dict[type, bool] = {}
+
+    def decode(self, s: str, _w=WHITESPACE.match) -> Any:
+        idx = _w(s, 0).end()
+        head = s[idx : idx + 1]
+        is_multirow = head == '[' if self.multirow is None else self.multirow
+        if head != ('[' if is_multirow else '{'):
+            # Not in the shape of the spec, which is left to the usual validation to report.
+            value = super().decode(s)
+            validate_data_spec(value, self.spec, multirow=is_multirow)
+            return value
+
+        _, self._ctx = _build_context([], self.spec, is_multirow, {}, parsing=False)
+        if is_multirow:
+            max_rows = get_limits(self.spec).get('max_rows')
+            value, end, validated = _run_task(self._iter_parse_array(s, idx + 1, self.spec, 1, max_rows, is_rows=True))
+            if not validated:
+                validate_data_spec(value, self.spec, multirow=True)
+        else:
+            value, end = _run_task(self._iter_parse_object(s, idx + 1, self.spec, 0))
+        end = _w(s, end).end()
+        if end != len(s):
+            raise JSONDecodeError('Extra data', s, end)
+        return value
+
+    def _scan(self, s: str, idx: int) -> Tuple[Any, int]:
+        try:
+            return self.scan_once(s, idx)
+        except StopIteration as err:
+            raise JSONDecodeError('Expecting value', s, err.value) from None
+
+    def _iter_parse_array(
+        self, s: str, end: int, spec, depth: int, max_length: Optional[int], is_rows=False, _w=WHITESPACE.match
+    ) -> Generator:
+        # Return the elements, the end index, and whether all the elements are objects validated against the spec.
+        values, validated = [], True
+        end = _w(s, end).end()
+        if s[end : end + 1] == ']':
+            return values, end + 1, validated
+
+        while True:
+            if max_length is not None and len(values) >= max_length:
+                what = 'rows exceeds max_rows' if is_rows else 'elements exceeds max_list_length'
+                raise LimitExceededError(f'reason: number of {what}({max_length})')
+            if s[end : end + 1] == '{':
+                value, end = yield self._iter_parse_object(s, end + 1, spec, depth)
+            else:
+                (value, end), validated = self._scan(s, end), False
+            values.append(value)
+
+            end = _w(s, end).end()
+            nextchar = s[end : end + 1]
+            end += 1
+            if nextchar == ']':
+                return values, end, validated
+            if nextchar != ',':
+                raise JSONDecodeError("Expecting ',' delimiter", s, end - 1)
+            end = _w(s, end).end()
+
+    def _descends_into(self, spec) -> bool:
+        # Whether a spec has nested objects validated while decoding, the other objects are decoded by C entirely.
+        if spec not in self._descending:
+            self._descending[spec] = any(
+                _nested_spec(checker, spec)[0] and COND_EXIST not in checker.checks
+                for checker in vars(spec).values()
+                if isinstance(checker, Checker)
+            )
+        return self._descending[spec]
+
+    def _iter_parse_object(self, s: str, end: int, spec, depth: int, _w=WHITESPACE.match) -> Generator:
+        ctx = self._ctx
+        ctx.depth = depth
+        ctx.ensure_depth(spec)
+        plan = compile_spec(spec)
+
+        if not self._descends_into(spec):
+            obj, end = self._scan(s, end - 1)
+            yield self._iter_validate_object(obj, spec, plan, set(), depth)
+            return obj, end
+
+        obj, descended = {}, set()
+        end = _w(s, end).end()
+        nextchar = s[end : end + 1]
+        if nextchar == '}':
+            yield self._iter_validate_object(obj, spec, plan, descended, depth)
+            return obj, end + 1
+        if nextchar != '"':
+            raise JSONDecodeError('Expecting property name enclosed in double quotes', s, end)
+        end += 1
+
+        while True:
+            key, end = scanstring(s, end, self.strict)
+            end = _w(s, end).end()
+            if s[end : end + 1] != ':':
+                raise JSONDecodeError("Expecting ':' delimiter", s, end)
+            end = _w(s, end + 1).end()
+
+            value, end, spec_field = yield self._iter_parse_field_value(s, end, spec, plan, key, depth)
+            obj[key] = value
+            if spec_field:
+                descended.add(spec_field)
+            elif descended:
+                # A duplicate key replaces the value validated already, which is validated with the object instead.
+                descended.difference_update(fk.spec_field for fk in plan.fields_by_data_key.get(key, ()))
+
+            end = _w(s, end).end()
+            nextchar = s[end : end + 1]
+            end += 1
+            if nextchar == '}':
+                break
+            if nextchar != ',':
+                raise JSONDecodeError("Expecting ',' delimiter", s, end - 1)
+            end = _w(s, end).end()
+            if s[end : end + 1] != '"':
+                raise JSONDecodeError('Expecting property name enclosed in double quotes', s, end)
+            end += 1
+
+        yield self._iter_validate_object(obj, spec, plan, descended, depth)
+        return obj, end
+
+    def _iter_parse_field_value(self, s: str, end: int, spec, plan: SpecPlan, key: str, depth: int) -> Generator:
+        # Return the value, the end index, and the spec field if the value is validated already.
+        field_keys = plan.fields_by_data_key.get(key, ())
+        if len(field_keys) == 1 and s[end : end + 1] in ('{', '['):
+            spec_field = field_keys[0].spec_field
+            checker = getattr(spec, spec_field)
+            kind, nested_spec = _nested_spec(checker, spec)
+            if kind and COND_EXIST not in checker.checks:
+                if kind == SPEC and s[end] == '{':
+                    value, end = yield self._iter_parse_object(s, end + 1, nested_spec, depth + 1)
+                    return value, end, spec_field
+                if kind != SPEC and s[end] == '[':
+                    value, end, validated = yield self._iter_parse_array(
+                        s, end + 1, nested_spec, depth + 1, self._ctx.max_list_length
+                    )
+                    return value, end, spec_field if validated else ''
+        value, end = self._scan(s, end)
+        return value, end, ''
+
+    def _iter_validate_object(self, obj: dict, spec, plan: SpecPlan, descended: Set[str], depth: int) -> Generator:
+        # The fields of the nested objects validated when they closed are not traversed again.
+        field_keys = [fk for fk in plan.field_keys if fk.spec_field not in descended] if descended else plan.field_keys
+        self._ctx.depth = depth
+        ok, failures = yield _iter_validate_spec(obj, spec, plan, field_keys, self._ctx)
+        if not ok:
+            raise _extract_error(self.spec, failures)
@@ -32,6 +32,7 @@ DUMMY = 'dummy'
 EMAIL = 'email'
 UUID = 'uuid'
 REGEX = 'regex'
+UNION = 'union'
 
 COND_EXIST = 'cond_exist'
 
@@ -46,6 +47,23 @@ class BaseValidator(metaclass=ABCMeta):
     def validate(value, extra, data):
         raise NotImplementedError
 
+    @staticmethod
+    def compile_config(config):
+        """
+        Return the configuration of the check, i.e. Checker(..., CHECK=config), compiled for validate, e.g. with the
+        bounds resolved. It's called once when the Checker is built, so an invalid configuration is raised at import
+        time. Read the result by get_compiled_config(extra, validator).
+        """
+        return config
+
+    @staticmethod
+    def normalize(value, extra):
+        """
+        Return the value converted by the check, e.g. a date for DATE. It's called by parse_data_spec only after the
+        check passed, the first passing check of a field which overrides it decides the parsed value.
+        """
+        return value
+
 
 # Wrapper prefix
 _wrapper_splitter = '-'
@@ -74,6 +92,31 @@ class DSVError(Exception):
         return repr(self._errors)
 
 
+class UnsafePatternWarning(UserWarning):
+    """
+    Warned when a REGEX pattern is prone to catastrophic backtracking and is not guarded by a timeout.
+    """
+
+
+class SpecConflictWarning(UserWarning):
+    """
+    Warned when the COND_EXIST relations of a spec contradict each other, i.e. a field or the spec can never be valid.
+    """
+
+
+class LimitExceededError(ValueError):
+    """
+    Raised when the data exceeds a limit of the validation, e.g. the maximum nesting depth.
+    The validation is aborted immediately, regardless of the ErrorMode.
+    """
+
+
+class ValidationTimeoutError(TimeoutError):
+    """
+    Raised when a validation runs out of its time budget, i.e. the deadline.
+    """
+
+
 class ValidateResult:
     def __init__(self, spec: Type = None, field: str = None, value: Any = None, check: str = None, error=None):
         # TODO: Output spec & check information when there's a debug message level for development.
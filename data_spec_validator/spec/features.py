@@ -1,16 +1,41 @@
-from typing import Callable, Optional, Set, Tuple, Type, Union
+from typing import Callable, Dict, FrozenSet, Optional, Set, Tuple, Type, Union
 
+from .adaptive import AdaptiveStats
 from .checks import Checker
 from .defines import FOREACH, SPEC, ErrorMode
+from .utils import raise_if
 
+LIMIT_KEYS = ('max_rows', 'max_list_length', 'max_depth', 'max_str_size', 'deadline')
 
-class _DSVFeatureParams:
-    __slots__ = ('_strict', '_any_keys_set', '_err_mode')
 
-    def __init__(self, strict, any_keys_set: Union[Set[Tuple[str, ...]], None], err_mode):
+class _DSVFeatureParams:
+    __slots__ = (
+        '_strict',
+        '_any_keys_set',
+        '_err_mode',
+        '_adaptive_stats',
+        '_limits',
+        '_expected_keys',
+        '_any_keys_groups',
+    )
+
+    def __init__(
+        self,
+        strict,
+        any_keys_set: Union[Set[Tuple[str, ...]], None],
+        err_mode,
+        adaptive: bool = False,
+        limits: Optional[Dict[str, int]] = None,
+        expected_keys: Optional[FrozenSet[str]] = None,
+    ):
         self._strict = strict
         self._any_keys_set = any_keys_set or set()
         self._err_mode = err_mode
+        self._adaptive_stats = AdaptiveStats() if adaptive else None
+        self._limits = limits or {}
+        # Resolved once here instead of per validation, the groups are in a stable order to report consistently.
+        self._expected_keys = expected_keys if strict else None
+        self._any_keys_groups = tuple(sorted(self._any_keys_set, key=lambda keys: tuple(map(str, keys))))
 
     @property
     def err_mode(self) -> ErrorMode:
@@ -24,48 +49,124 @@ class _DSVFeatureParams:
     def any_keys_set(self) -> set:
         return self._any_keys_set
 
+    @property
+    def expected_keys(self) -> Optional[FrozenSet[str]]:
+        """
+        The data keys, i.e. the aliases or the field names, allowed by a strict spec, None if it's not strict.
+        """
+        return self._expected_keys
+
+    @property
+    def any_keys_groups(self) -> Tuple[Tuple[str, ...], ...]:
+        return self._any_keys_groups
+
+    @property
+    def adaptive_stats(self) -> Optional[AdaptiveStats]:
+        return self._adaptive_stats
+
+    @property
+    def limits(self) -> Dict[str, int]:
+        return self._limits
+
     def __repr__(self):
-        return f'_DSVFeatureParams(strict={self._strict}, any_keys_set={self._any_keys_set}, err_mode={self._err_mode})'
+        return (
+            f'_DSVFeatureParams(strict={self._strict}, any_keys_set={self._any_keys_set}, err_mode={self._err_mode}, '
+            f'adaptive={self._adaptive_stats is not None}, limits={self._limits})'
+        )
 
 
 _FEAT_PARAMS = '__feat_params__'
 
 
+def ensure_limits(limits: Dict[str, Optional[int]]):
+    unknown = sorted(set(limits.keys()) - set(LIMIT_KEYS))
+    raise_if(bool(unknown), TypeError(f'Unknown limits: {", ".join(unknown)}'))
+    for key, limit in limits.items():
+        if key == 'deadline':
+            raise_if(
+                limit is not None and (type(limit) not in (int, float) or limit <= 0),
+                TypeError(f'Limit {key} must be a positive number of seconds or None, but got {limit!r}'),
+            )
+        else:
+            raise_if(
+                limit is not None and (type(limit) != int or limit < 0),
+                TypeError(f'Limit {key} must be a non-negative int or None, but got {limit!r}'),
+            )
+
+
 def _process_class(
-    cls: Type, strict: bool, any_keys_set: Union[Set[Tuple[str, ...]], None], err_mode: ErrorMode
+    cls: Type,
+    strict: bool,
+    any_keys_set: Union[Set[Tuple[str, ...]], None],
+    err_mode: ErrorMode,
+    adaptive: bool,
+    limits: Optional[Dict[str, int]],
 ) -> Type:
-    setattr(cls, _FEAT_PARAMS, _DSVFeatureParams(strict, any_keys_set, err_mode))
+    raise_if(
+        adaptive and err_mode == ErrorMode.ALL,
+        ValueError('adaptive=True stops at the first failure, which cannot be used with ErrorMode.ALL'),
+    )
+    ensure_limits(limits or {})
+    expected_keys = frozenset(
+        checker.alias or name for name, checker in cls.__dict__.items() if isinstance(checker, Checker)
+    )
+    setattr(cls, _FEAT_PARAMS, _DSVFeatureParams(strict, any_keys_set, err_mode, adaptive, limits, expected_keys))
 
     return cls
 
 
 def dsv_feature(
-    strict: bool = False, any_keys_set: Optional[Set[Tuple[str, ...]]] = None, err_mode=ErrorMode.MSE
+    strict: bool = False,
+    any_keys_set: Optional[Set[Tuple[str, ...]]] = None,
+    err_mode=ErrorMode.MSE,
+    adaptive: bool = False,
+    limits: Optional[Dict[str, int]] = None,
 ) -> Callable:
+    """
+    strict: boolean
+            Set strict to True, keys which are not defined in the spec are not allowed
+    any_keys_set: set of tuples
+            At least one key of each tuple must exist
+    err_mode: ErrorMode
+    adaptive: boolean
+            Set adaptive to True, the fields & checks are validated fail-fast, in an order learned from the observed
+            failure rates and costs, see get_adaptive_order & freeze_adaptive_order
+    limits: dict
+            The payload limits, max_rows/max_list_length/max_depth/max_str_size/deadline, see validate_data_spec. Like
+            err_mode, the limits of the OUTER-MOST spec are applied, and can be overridden by validate_data_spec
+    """
+
     def wrap(cls: Type) -> Type:
-        return _process_class(cls, strict, any_keys_set, err_mode)
+        return _process_class(cls, strict, any_keys_set, err_mode, adaptive, limits)
 
     return wrap
 
 
+def get_feature_params(spec) -> Optional[_DSVFeatureParams]:
+    return getattr(spec, _FEAT_PARAMS, None)
+
+
 def get_err_mode(spec) -> ErrorMode:
     feat_params: Union[_DSVFeatureParams, None] = getattr(spec, _FEAT_PARAMS, None)
     return feat_params.err_mode if feat_params else ErrorMode.MSE
 
 
-def is_strict(spec) -> bool:
+def get_adaptive_stats(spec) -> Optional[AdaptiveStats]:
     feat_params: Union[_DSVFeatureParams, None] = getattr(spec, _FEAT_PARAMS, None)
-    return bool(feat_params and feat_params.strict)
+    return feat_params.adaptive_stats if feat_params else None
 
 
-def get_any_keys_set(spec) -> Set[Tuple[str, ...]]:
+def get_limits(spec) -> Dict[str, int]:
     feat_params: Union[_DSVFeatureParams, None] = getattr(spec, _FEAT_PARAMS, None)
-    return feat_params.any_keys_set if feat_params else set()
+    return feat_params.limits if feat_params else {}
+
+
+MULTIROW_FIELD = 'dsv_multirow'
 
 
 def repack_multirow(data, spec):
     class _InternalMultiSpec:
         dsv_multirow = Checker([FOREACH], FOREACH=SPEC, SPEC=spec)
 
-    new_data = dict(dsv_multirow=data)
+    new_data = {MULTIROW_FIELD: data}
     return new_data, _InternalMultiSpec
@@ -0,0 +1,194 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .actions import _build_context, _extract_error, validate_data_spec
+from .checks import COND_EXIST, DICT, FOREACH, LIST, LIST_OF, SPEC, Checker
+from .defines import SELF, LimitExceededError, ValidationTimeoutError
+from .plan import compile_spec
+from .utils import raise_if
+from .validators import _iter_validate_spec, _run_task
+
+_PATCH_OPS = ('add', 'remove', 'replace', 'move', 'copy', 'test')
+# The ops adding or removing a key (or an element), which the spec-wise checks depend on.
+_STRUCTURAL_OPS = ('add', 'remove', 'move', 'copy')
+
+# A nested spec can be descended into only when the other checks of the field don't depend on its content.
+_SPEC_FIELD_CHECKS = frozenset([SPEC, DICT, COND_EXIST])
+_LIST_FIELD_CHECKS = frozenset([LIST_OF, FOREACH, LIST, COND_EXIST])
+
+
+class _PatchTarget:
+    """
+    A dict of the document to validate again against its spec, either entirely (keys is None) or the fields of the
+    changed keys only.
+    """
+
+    __slots__ = ('spec', 'node', 'depth', 'keys', 'structural')
+
+    def __init__(self, spec, node, depth: int):
+        self.spec = spec
+        self.node = node
+        self.depth = depth
+        self.keys: Optional[Set[str]] = set()
+        self.structural = False
+
+
+def _parse_pointer(pointer) -> List[str]:
+    raise_if(
+        type(pointer) != str or (pointer and not pointer.startswith('/')),
+        ValueError(f'Invalid JSON pointer: {pointer!r}'),
+    )
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer.split('/')[1:]]
+
+
+def _parse_index(token: str, values: list) -> Optional[int]:
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        return None
+    idx = int(token)
+    return idx if idx < len(values) else None
+
+
+def _nested_spec(checker: Checker, spec) -> Tuple[Optional[str], Optional[type]]:
+    # Return the kind (SPEC or LIST_OF) and the spec of the nested dicts of a field.
+    if checker.is_op_any:
+        return None, None
+    target = checker.extra.get(SPEC)
+    target = spec if target == SELF else target
+    if type(target) != type:
+        return None, None
+
+    checks = frozenset(checker.checks)
+    if SPEC in checks and checks <= _SPEC_FIELD_CHECKS:
+        return SPEC, target
+    if (
+        checks & {LIST_OF, FOREACH}
+        and checks <= _LIST_FIELD_CHECKS
+        and all(checker.extra.get(check) == SPEC for check in (LIST_OF, FOREACH) if check in checks)
+    ):
+        return LIST_OF, target
+    return None, None
+
+
+class _PatchLocator:
+    def __init__(self, document, spec, multirow: bool):
+        self.document = document
+        self.spec = spec
+        self.multirow = multirow
+        self.targets: Dict[Tuple[int, type], _PatchTarget] = {}
+
+    def _get_target(self, spec, node, depth: int) -> _PatchTarget:
+        key = (id(node), spec)
+        if key not in self.targets:
+            self.targets[key] = _PatchTarget(spec, node, depth)
+        return self.targets[key]
+
+    def _add_whole(self, spec, node, depth: int) -> bool:
+        if not hasattr(node, 'keys'):
+            # Not a dict to validate against the spec, left to validate_data_spec reporting it.
+            return False
+        self._get_target(spec, node, depth).keys = None
+        return True
+
+    def _add_key(self, spec, node, depth: int, key: str, structural: bool):
+        target = self._get_target(spec, node, depth)
+        if target.keys is not None:
+            target.keys.add(key)
+        target.structural = target.structural or structural
+
+    def locate(self, tokens: List[str], structural: bool) -> bool:
+        """
+        Record the spec fields affected by a change at the path, and return False if the whole document has to be
+        validated again.
+        """
+        node, spec, depth = self.document, self.spec, 0
+        if self.multirow:
+            if not tokens or type(node) != list:
+                return False
+            idx = _parse_index(tokens[0], node)
+            if tokens[0] == '-' and len(tokens) == 1 and node:
+                # A row appended.
+                idx = len(node) - 1
+            if idx is None:
+                # The last row removed leaves nothing to validate, the rows are validated independently.
+                return len(tokens) == 1 and tokens[0].isdigit()
+            if len(tokens) == 1 or not hasattr(node[idx], 'keys'):
+                return self._add_whole(spec, node[idx], 1)
+            node, depth, tokens = node[idx], 1, tokens[1:]
+
+        if not tokens or not hasattr(node, 'keys'):
+            return False
+
+        while True:
+            key, rest = tokens[0], tokens[1:]
+            field_keys = compile_spec(spec).fields_by_data_key.get(key, ())
+            if rest and len(field_keys) == 1:
+                checker = getattr(spec, field_keys[0].spec_field)
+                kind, nested_spec = _nested_spec(checker, spec)
+                child = node.get(key)
+                if kind == SPEC and hasattr(child, 'keys'):
+                    node, spec, depth, tokens = child, nested_spec, depth + 1, rest
+                    continue
+                if kind == LIST_OF and type(child) == list:
+                    idx = _parse_index(rest[0], child)
+                    if idx is not None and (len(rest) > 1 or not structural):
+                        element = child[idx]
+                        if len(rest) > 1 and hasattr(element, 'keys'):
+                            node, spec, depth, tokens = element, nested_spec, depth + 1, rest[1:]
+                            continue
+                        return self._add_whole(nested_spec, element, depth + 1)
+            # The field of the key is validated again, with the spec-wise checks if the key is added or removed.
+            self._add_key(spec, node, depth, key, structural and not rest)
+            return True
+
+
+def _validate_targets(data, spec, targets: Iterable[_PatchTarget], kwargs: Dict) -> bool:
+    is_multirow = kwargs.get('multirow', False)
+    nothrow = kwargs.get('nothrow', False)
+
+    failures = []
+    try:
+        _, ctx = _build_context(data, spec, is_multirow, kwargs, parsing=False)
+        for target in targets:
+            plan = compile_spec(target.spec)
+            if target.keys is None:
+                field_keys, with_features = plan.field_keys, True
+            else:
+                field_keys, with_features = plan.affected_field_keys(target.keys), target.structural
+            ctx.depth = target.depth
+            _, target_failures = _run_task(
+                _iter_validate_spec(target.node, target.spec, plan, field_keys, ctx, with_features=with_features)
+            )
+            failures.extend(target_failures)
+    except (LimitExceededError, ValidationTimeoutError):
+        if nothrow:
+            return False
+        raise
+
+    if failures and not nothrow:
+        raise _extract_error(spec, failures)
+    return not failures
+
+
+def validate_json_patch(document, spec, patch: List[Dict], **kwargs) -> bool:
+    """
+    Validate a document, which was valid before the JSON Patch (RFC 6902) operations are applied to it, by validating
+    again only the parts affected by the operations, i.e. the fields at the paths (nested SPEC & LIST_OF/FOREACH
+    elements included), their COND_EXIST dependents, and the strict & any_keys_set features of the dicts whose keys
+    are added or removed. The patch has to be applied to the document already, e.g. by jsonpatch.
+    kwargs: the same as validate_data_spec, except parse & partial
+    """
+    is_multirow = kwargs.get('multirow', False)
+    raise_if(type(patch) != list, TypeError(f'A patch must be a list of operations, got {type(patch)}'))
+
+    locator = _PatchLocator(document, spec, is_multirow)
+    for operation in patch:
+        op = operation.get('op') if type(operation) == dict else None
+        raise_if(op not in _PATCH_OPS, ValueError(f'Invalid JSON patch operation: {operation!r}'))
+        if op == 'test':
+            continue
+
+        paths = [operation.get('path')] + ([operation.get('from')] if op == 'move' else [])
+        for path in paths:
+            if not locator.locate(_parse_pointer(path), op in _STRUCTURAL_OPS):
+                return validate_data_spec(document, spec, **kwargs)
+
+    return _validate_targets(document, spec, locator.targets.values(), kwargs)
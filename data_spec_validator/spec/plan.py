@@ -0,0 +1,233 @@
+import warnings
+import weakref
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .checks import Checker, Source, get_compiled_config, get_validator
+from .defines import COND_EXIST, SPEC, UNION, SpecConflictWarning
+from .utils import raise_if
+
+_PLAN = '__dsv_plan__'
+
+# The specs compiled so far, e.g. for freeze_specs.
+_compiled_specs: 'weakref.WeakSet[type]' = weakref.WeakSet()
+
+
+class FieldKey(NamedTuple):
+    spec_field: str
+    data_field: Optional[str] = None
+
+
+# The FieldKeys and the tuples of a single one, shared by the specs of the same fields.
+_interned_field_keys: Dict[Tuple[str, Optional[str]], Tuple[FieldKey]] = {}
+
+
+def _intern_field_key(spec_field: str, data_field: Optional[str]) -> Tuple[FieldKey]:
+    interned = _interned_field_keys.get((spec_field, data_field))
+    if interned is None:
+        interned = _interned_field_keys[(spec_field, data_field)] = (FieldKey(spec_field, data_field),)
+    return interned
+
+
+class _CondExistRelation:
+    __slots__ = ('field_key', 'with_keys', 'without_keys', 'allow_unknown')
+
+    def __init__(self, field_key: FieldKey, with_keys: Tuple[str, ...], without_keys: Tuple[str, ...], allow_unknown):
+        self.field_key = field_key
+        self.with_keys = with_keys
+        self.without_keys = without_keys
+        self.allow_unknown = allow_unknown
+
+
+class _CondExistGraph:
+    """
+    The COND_EXIST relations of a spec, i.e. a field requires (WITH) or excludes (WITHOUT) the other data keys when
+    it's present, evaluated once per payload instead of once per field.
+    """
+
+    __slots__ = ('relations', 'keys')
+
+    def __init__(self, relations: List[_CondExistRelation]):
+        self.relations = relations
+        keys = set()
+        for rel in relations:
+            keys.add(rel.field_key.data_field)
+            keys.update(rel.with_keys)
+            keys.update(rel.without_keys)
+        self.keys: FrozenSet[str] = frozenset(keys)
+
+    def evaluate(self, data) -> Dict[str, Tuple[bool, Union[Exception, str]]]:
+        # A single pass over the keys involved, then each relation is a set lookup.
+        present = {key for key in self.keys if key in data}
+        results = {}
+        for rel in self.relations:
+            if rel.field_key.data_field not in present:
+                results[rel.field_key.spec_field] = (
+                    (True, '') if rel.allow_unknown else (False, LookupError('must exist'))
+                )
+                continue
+
+            missing = [key for key in rel.with_keys if key not in present]
+            conflicting = [key for key in rel.without_keys if key in present]
+            if not missing and not conflicting:
+                results[rel.field_key.spec_field] = (True, '')
+                continue
+
+            # Every violated relation is reported.
+            reasons = []
+            if missing:
+                reasons.append(f'{", ".join(missing)} must exist')
+            if conflicting:
+                reasons.append(f'{", ".join(conflicting)} must not exist')
+            results[rel.field_key.spec_field] = (False, KeyError('; '.join(reasons)))
+        return results
+
+    def dependents(self, keys: Set[str]) -> Set[str]:
+        # The fields whose relation involves one of the keys.
+        return {
+            rel.field_key.spec_field
+            for rel in self.relations
+            if rel.field_key.data_field in keys
+            or any(key in keys for key in rel.with_keys)
+            or any(key in keys for key in rel.without_keys)
+        }
+
+    def find_conflicts(self, required_keys: Set[str]) -> List[str]:
+        """
+        Return the contradictions of the relations, i.e. the keys which can never be present, since they require,
+        directly or through a chain (or cycle) of WITH, a key which they exclude. A WITH cycle alone is an all-or-none
+        group, and mutual WITHOUT is an either-or, both are fine.
+        """
+        with_map = {rel.field_key.data_field: rel.with_keys for rel in self.relations}
+        without_map = {rel.field_key.data_field: rel.without_keys for rel in self.relations}
+
+        def _closure(keys) -> Set[str]:
+            reached, stack = set(), list(keys)
+            while stack:
+                key = stack.pop()
+                if key not in reached:
+                    reached.add(key)
+                    stack.extend(with_map.get(key, ()))
+            return reached
+
+        def _excluded(keys: Set[str]) -> Set[str]:
+            return {excluded for key in keys for excluded in without_map.get(key, ())}
+
+        conflicts = []
+        for key in sorted(with_map):
+            implied = _closure([key])
+            clashed = sorted(implied & _excluded(implied))
+            if clashed:
+                conflicts.append(f'{key} can never be present, it implies both the existence and absence of {clashed}')
+
+        implied = _closure(required_keys)
+        clashed = sorted(implied & _excluded(implied))
+        if clashed:
+            conflicts.append(f'no data can be valid, the required fields exclude {clashed}')
+        return conflicts
+
+
+class SpecPlan:
+    """
+    The per-spec structures resolved once, when the spec is first validated or by compile_spec.
+    """
+
+    __slots__ = ('field_keys', 'fields_by_data_key', 'cond_exist', 'sources')
+
+    def __init__(
+        self,
+        field_keys: List[FieldKey],
+        cond_exist: Optional[_CondExistGraph],
+        sources: Optional[Dict[str, Optional[Source]]] = None,
+    ):
+        self.field_keys = field_keys
+        # The sources of the data fields, None if no Checker declares one.
+        self.sources = sources
+        # The alias index, for walking the fields by the keys present in the data.
+        fields_by_data_key: Dict[str, Tuple[FieldKey, ...]] = {}
+        for fk in field_keys:
+            same_keys = fields_by_data_key.get(fk.data_field)
+            fields_by_data_key[fk.data_field] = same_keys + (fk,) if same_keys else _intern_field_key(*fk)
+        self.fields_by_data_key = fields_by_data_key
+        self.cond_exist = cond_exist
+
+    def present_field_keys(self, data) -> List[FieldKey]:
+        fields_by_data_key = self.fields_by_data_key
+        return [fk for key in data.keys() if key in fields_by_data_key for fk in fields_by_data_key[key]]
+
+    def affected_field_keys(self, data_keys: Set[str]) -> List[FieldKey]:
+        """
+        Return the fields to validate again once the values of the data keys change, i.e. their own fields and the
+        ones related to them by COND_EXIST, in the spec order.
+        """
+        spec_fields = {fk.spec_field for key in data_keys for fk in self.fields_by_data_key.get(key, ())}
+        if self.cond_exist:
+            spec_fields |= self.cond_exist.dependents(data_keys)
+        return [fk for fk in self.field_keys if fk.spec_field in spec_fields]
+
+
+def _build_plan(spec) -> SpecPlan:
+    raise_if(type(spec) != type, RuntimeError(f'{spec} should be a spec class'))
+
+    field_keys, relations, required_keys, sources = [], [], set(), {}
+    for f_name, checker in spec.__dict__.items():
+        if not isinstance(checker, Checker):
+            continue
+        (key,) = _intern_field_key(f_name, checker.alias if checker.alias else f_name)
+        field_keys.append(key)
+        sources[key.data_field] = checker.source
+        if not checker.allow_optional:
+            required_keys.add(key.data_field)
+        if COND_EXIST in checker.checks:
+            with_keys, without_keys = get_compiled_config(checker.extra, get_validator(COND_EXIST))
+            relations.append(_CondExistRelation(key, with_keys, without_keys, checker.allow_optional))
+
+    cond_exist = _CondExistGraph(relations) if relations else None
+    if cond_exist:
+        for conflict in cond_exist.find_conflicts(required_keys):
+            warnings.warn(SpecConflictWarning(f'[DSV][WARNING] COND_EXIST of {spec.__name__}: {conflict}'))
+    return SpecPlan(field_keys, cond_exist, sources if any(sources.values()) else None)
+
+
+def _nested_spec_classes(checker: Checker) -> List[type]:
+    # The specs validated by a field, i.e. of SPEC (LIST_OF & FOREACH included) and UNION.
+    specs = [checker.extra.get(SPEC)]
+    union = checker.extra.get(UNION)
+    if type(union) == dict and type(union.get('specs')) == dict:
+        specs.extend(union['specs'].values())
+    return [spec for spec in specs if type(spec) == type]
+
+
+def _compile_nested(spec):
+    compiled, stack = {spec}, [spec]
+    while stack:
+        current = stack.pop()
+        compile_spec(current)
+        for checker in vars(current).values():
+            if not isinstance(checker, Checker):
+                continue
+            for check in checker.checks:
+                get_validator(check)
+            for nested_spec in _nested_spec_classes(checker):
+                if nested_spec not in compiled:
+                    compiled.add(nested_spec)
+                    stack.append(nested_spec)
+
+
+def get_compiled_specs() -> List[type]:
+    return list(_compiled_specs)
+
+
+def compile_spec(spec, nested: bool = False) -> SpecPlan:
+    """
+    Return the compiled plan of a spec class, which is compiled on the first call and cached in the class.
+    nested: boolean, compile the nested specs as well, and resolve the validators of every check, leaving nothing to
+            the first validation
+    """
+    plan = spec.__dict__.get(_PLAN) if type(spec) == type else None
+    if plan is None:
+        plan = _build_plan(spec)
+        setattr(spec, _PLAN, plan)
+        _compiled_specs.add(spec)
+    if nested:
+        _compile_nested(spec)
+    return plan
@@ -0,0 +1,226 @@
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover, python < 3.11
+    import sre_parse
+
+# The alphabet on which the character sets of a pattern are compared, enough to tell the usual classes apart.
+_SAMPLE = frozenset(range(256))
+_CATEGORY_PATTERNS = {
+    'CATEGORY_DIGIT': r'\d',
+    'CATEGORY_NOT_DIGIT': r'\D',
+    'CATEGORY_SPACE': r'\s',
+    'CATEGORY_NOT_SPACE': r'\S',
+    'CATEGORY_WORD': r'\w',
+    'CATEGORY_NOT_WORD': r'\W',
+}
+
+
+@lru_cache(1)
+def _get_category_sets() -> Dict[str, FrozenSet[int]]:
+    return {
+        name: frozenset(c for c in _SAMPLE if re.match(regex, chr(c))) for name, regex in _CATEGORY_PATTERNS.items()
+    }
+
+
+_REPEATS = ('MAX_REPEAT', 'MIN_REPEAT')
+_ZERO_WIDTH = ('AT', 'ASSERT', 'ASSERT_NOT')
+
+NESTED_QUANTIFIER = 'nested quantifier'
+OVERLAPPING_ALTERNATION = 'overlapping alternation'
+
+_CHARS = FrozenSet[int]
+
+
+def _in_chars(items) -> _CHARS:
+    chars, negate = set(), False
+    for op, av in items:
+        name = str(op)
+        if name == 'NEGATE':
+            negate = True
+        elif name == 'LITERAL':
+            chars.add(av)
+        elif name.startswith('RANGE'):
+            chars.update(range(av[0], min(av[1], max(_SAMPLE)) + 1))
+        elif name == 'CATEGORY':
+            chars.update(_get_category_sets().get(str(av), _SAMPLE))
+        else:
+            chars.update(_SAMPLE)
+    return _SAMPLE - chars if negate else frozenset(chars)
+
+
+def _first(items: Sequence) -> Tuple[_CHARS, bool]:
+    """
+    Return the characters a sequence of parsed items can start with, and whether it can match the empty string.
+    """
+    chars = set()
+    for op, av in items:
+        name = str(op)
+        if name == 'LITERAL':
+            return frozenset(chars | {av}), False
+        elif name == 'NOT_LITERAL':
+            return frozenset(chars | (_SAMPLE - {av})), False
+        elif name == 'ANY':
+            return _SAMPLE, False
+        elif name == 'IN':
+            return frozenset(chars | _in_chars(av)), False
+        elif name in _ZERO_WIDTH:
+            continue
+        elif name in ('SUBPATTERN', 'ATOMIC_GROUP'):
+            sub_chars, nullable = _first(av[-1] if name == 'SUBPATTERN' else av)
+        elif name == 'BRANCH':
+            firsts = [_first(alt) for alt in av[1]]
+            sub_chars, nullable = frozenset().union(*(f for f, _ in firsts)), any(n for _, n in firsts)
+        elif name in _REPEATS or name == 'POSSESSIVE_REPEAT':
+            sub_chars, nullable = _first(av[2])
+            nullable = nullable or av[0] == 0
+        else:
+            # Back references, conditional groups, etc., assume the worst.
+            return _SAMPLE, True
+        chars.update(sub_chars)
+        if not nullable:
+            return frozenset(chars), False
+    return frozenset(chars), True
+
+
+def _is_repeating(op, av) -> bool:
+    return str(op) in _REPEATS and av[1] > 1
+
+
+def _find_ambiguity(items: Sequence, after: _CHARS, issues: List[str]):
+    # Look for the places inside the body of a loop where the same input can be consumed in more than one way, i.e.
+    # a repeat which can hand its characters over to what follows it, or alternatives starting with the same ones.
+    for idx, (op, av) in enumerate(items):
+        name = str(op)
+        follow, nullable = _first(items[idx + 1 :])
+        if nullable:
+            follow = follow | after
+
+        if _is_repeating(op, av):
+            if _first(av[2])[0] & follow:
+                issues.append(NESTED_QUANTIFIER)
+        elif name == 'BRANCH':
+            firsts = []
+            for alt in av[1]:
+                alt_chars, alt_nullable = _first(alt)
+                firsts.append(alt_chars | follow if alt_nullable else alt_chars)
+                _find_ambiguity(alt, follow, issues)
+            if any(a & b for i, a in enumerate(firsts) for b in firsts[i + 1 :]):
+                issues.append(OVERLAPPING_ALTERNATION)
+        elif name == 'SUBPATTERN':
+            _find_ambiguity(av[-1], follow, issues)
+
+
+def _walk(items: Sequence, issues: List[str]):
+    for op, av in items:
+        name = str(op)
+        if name in _REPEATS:
+            if av[1] == sre_parse.MAXREPEAT:
+                body = av[2]
+                _find_ambiguity(body, _first(body)[0], issues)
+            _walk(av[2], issues)
+        elif name == 'POSSESSIVE_REPEAT':
+            _walk(av[2], issues)
+        elif name == 'SUBPATTERN':
+            _walk(av[-1], issues)
+        elif name == 'ATOMIC_GROUP':
+            _walk(av, issues)
+        elif name == 'BRANCH':
+            for alt in av[1]:
+                _walk(alt, issues)
+        elif name in ('ASSERT', 'ASSERT_NOT'):
+            _walk(av[1], issues)
+
+
+def analyze_pattern(pattern: Any) -> List[str]:
+    """
+    Return the catastrophic backtracking shapes found in a pattern, e.g. ['nested quantifier'] for r'(a+)+$', an
+    empty list if none is found. It's a heuristic, the shapes are potentially, not necessarily, exponential.
+    """
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags
+    else:
+        flags = 0
+    issues = []
+    _walk(sre_parse.parse(pattern, flags), issues)
+    return list(dict.fromkeys(issues))
+
+
+def _match_in_worker(method: str, pattern: Any, value: str) -> bool:
+    return bool(getattr(re, method)(pattern, value))
+
+
+class _RegexGuard:
+    """
+    Evaluates patterns in worker processes, the workers are killed and replaced once a matching runs out of time.
+    A thread can not do the job, since re holds the GIL and can't be interrupted during a matching.
+
+    The workers are spawned instead of forked, a process forked while another thread holds a lock, e.g. of a threaded
+    server, may deadlock. The matchings of the other threads on the workers killed are submitted to the new ones.
+    """
+
+    # The times a matching is submitted again because the workers are killed by other matchings running out of time.
+    max_resubmits = 3
+    # How often a waiting matching checks whether its workers are killed, in seconds.
+    poll_interval = 0.05
+
+    def __init__(self, processes: int):
+        self._processes = processes
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _get_pool(self):
+        # multiprocessing is imported once a pattern is guarded by a timeout.
+        import multiprocessing
+
+        with self._lock:
+            # The pool is not inherited by forked processes, e.g. the workers of a pre-fork server.
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = multiprocessing.get_context('spawn').Pool(self._processes)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _discard_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.terminate()
+
+    def _wait(self, pool, result, timeout: float) -> Tuple[bool, Any]:
+        # Return whether the matching is done, and its result, False if the pool is discarded by another matching.
+        from multiprocessing import TimeoutError as PoolTimeoutError
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                return True, result.get(max(0.0, min(remaining, self.poll_interval)))
+            except PoolTimeoutError:
+                if self._pool is not pool:
+                    return False, None
+                if remaining <= self.poll_interval:
+                    raise
+
+    def match(self, method: str, pattern: Any, value: str, timeout: float) -> bool:
+        from multiprocessing import TimeoutError as PoolTimeoutError
+
+        for _ in range(self.max_resubmits + 1):
+            pool = self._get_pool()
+            try:
+                done, matched = self._wait(pool, pool.apply_async(_match_in_worker, (method, pattern, value)), timeout)
+            except PoolTimeoutError:
+                self._discard_pool(pool)
+                break
+            if done:
+                return matched
+        raise TimeoutError(f'Matching "{getattr(pattern, "pattern", pattern)}" exceeds the timeout({timeout}s)')
+
+
+regex_guard = _RegexGuard(processes=min(4, os.cpu_count() or 1))
@@ -0,0 +1,222 @@
+import codecs
+import json
+import re
+from json.decoder import JSONDecodeError
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from .actions import _build_context, _extract_error, _incompatible_rows_error
+from .defines import LimitExceededError
+from .features import get_limits
+from .plan import compile_spec
+from .utils import raise_if
+from .validators import _iter_validate_spec, _run_task
+
+_NON_WS = re.compile(r'[^ \t\n\r]')
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[,\]{}\[" \t\n\r]')
+
+# The states of the scanner around the elements of the top-level array.
+_BEFORE_ARRAY = 'before array'
+_FIRST_VALUE = 'first value'
+_VALUE = 'value'
+_ELEMENT = 'element'
+_AFTER_VALUE = 'after value'
+_DONE = 'done'
+
+
+class _RowScanner:
+    """
+    Split the text of a top-level JSON array, fed chunk by chunk, into the texts of its elements. Only the brackets &
+    the strings are tracked to find where an element ends, the element itself is decoded by json.
+    """
+
+    def __init__(self, max_row_size: Optional[int]):
+        self.max_row_size = max_row_size
+        self.buf = ''
+        # Where the buffer starts in the whole text, the positions of the errors are reported in the whole text.
+        self.offset = 0
+        self.lineno = 1
+        self.line_start = 0
+        self.pos = 0
+        self.start = 0
+        self.state = _BEFORE_ARRAY
+        self.depth = 0
+        self.in_string = False
+        self.scalar = False
+
+    def feed(self, text: str, final: bool = False) -> Iterator[str]:
+        # The consumed text is dropped, so the buffer holds at most one element and a chunk.
+        consumed = self.start if self.state == _ELEMENT else self.pos
+        newlines = self.buf.count('\n', 0, consumed)
+        if newlines:
+            self.lineno += newlines
+            self.line_start = self.offset + self.buf.rindex('\n', 0, consumed) + 1
+        self.offset += consumed
+        self.buf = self.buf[consumed:] + text
+        self.pos -= consumed
+        self.start -= consumed
+
+        while True:
+            if self.state == _ELEMENT:
+                end = self._scan_element(final)
+                if end is None:
+                    self._ensure_row_size(len(self.buf) - self.start)
+                    break
+                self._ensure_row_size(end - self.start)
+                self.state = _AFTER_VALUE
+                yield self.buf[self.start : end]
+                continue
+
+            m = _NON_WS.search(self.buf, self.pos)
+            if not m:
+                self.pos = len(self.buf)
+                break
+            self.pos, ch = m.start(), m.group()
+            if self.state == _BEFORE_ARRAY:
+                if ch != '[':
+                    raise self.decode_error('Expecting an array of rows', self.pos)
+                self.pos, self.state = self.pos + 1, _FIRST_VALUE
+            elif self.state == _FIRST_VALUE and ch == ']':
+                self.pos, self.state = self.pos + 1, _DONE
+            elif self.state in (_FIRST_VALUE, _VALUE):
+                self.start, self.state = self.pos, _ELEMENT
+                self.depth, self.in_string, self.scalar = 0, False, False
+            elif self.state == _AFTER_VALUE:
+                if ch not in ',]':
+                    raise self.decode_error("Expecting ',' delimiter", self.pos)
+                self.pos, self.state = self.pos + 1, _VALUE if ch == ',' else _DONE
+            else:
+                raise self.decode_error('Extra data', self.pos)
+
+        if final and self.state != _DONE:
+            raise self.decode_error('Unterminated array of rows', len(self.buf))
+
+    def decode_error(self, msg: str, pos: int) -> JSONDecodeError:
+        # The error at the position in the buffer, reported at the position in the whole text like json.loads does.
+        # Only the buffered part of the text is kept as its doc.
+        newline = self.buf.rfind('\n', 0, pos)
+        lineno = self.lineno + self.buf.count('\n', 0, pos)
+        colno = pos - newline if newline >= 0 else self.offset + pos - self.line_start + 1
+        err = JSONDecodeError(msg, self.buf, pos)
+        err.pos, err.lineno, err.colno = self.offset + pos, lineno, colno
+        err.args = (f'{msg}: line {lineno} column {colno} (char {err.pos})',)
+        return err
+
+    def _ensure_row_size(self, size: int):
+        if self.max_row_size is not None and size > self.max_row_size:
+            raise LimitExceededError(f'reason: size of row exceeds max_row_size({self.max_row_size})')
+
+    def _scan_element(self, final: bool) -> Optional[int]:
+        # Return the end index of the element, or None if it doesn't end in the buffer yet.
+        buf = self.buf
+        if self.pos == self.start and not self.in_string and self.depth == 0:
+            ch = buf[self.pos]
+            self.pos += 1
+            if ch in '{[':
+                self.depth = 1
+            elif ch == '"':
+                self.in_string = True
+            else:
+                self.scalar = True
+
+        if self.scalar:
+            m = _SCALAR_END.search(buf, self.pos)
+            self.pos = m.start() if m else len(buf)
+            return self.pos if m or final else None
+
+        while True:
+            if self.in_string:
+                m = _STRING_END.search(buf, self.pos)
+                if not m:
+                    self.pos = len(buf)
+                    return None
+                if m.group() == '\\':
+                    if m.end() >= len(buf):
+                        # The escaped character is in the next chunk.
+                        self.pos = m.start()
+                        return None
+                    self.pos = m.end() + 1
+                    continue
+                self.in_string, self.pos = False, m.end()
+                if self.depth == 0:
+                    return self.pos
+                continue
+
+            m = _STRUCTURE.search(buf, self.pos)
+            if not m:
+                self.pos = len(buf)
+                return None
+            ch, self.pos = m.group(), m.end()
+            if ch == '"':
+                self.in_string = True
+            elif ch in '{[':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.pos
+
+
+def _iter_texts(stream, chunk_size: int, max_body_size: Optional[int]) -> Iterator[Tuple[str, bool]]:
+    # Yield the decoded texts, and whether it's the last one.
+    chunks: Iterable = iter(lambda: stream.read(chunk_size), b'') if hasattr(stream, 'read') else stream
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    size = 0
+    for chunk in chunks:
+        if not chunk:
+            # A str stream ends with ''.
+            break
+        size += len(chunk)
+        if max_body_size is not None and size > max_body_size:
+            raise LimitExceededError(f'reason: size of body exceeds max_body_size({max_body_size})')
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk, False
+    yield decoder.decode(b'', final=True), True
+
+
+def iter_validated_rows(
+    stream,
+    spec,
+    chunk_size: int = 64 * 1024,
+    max_body_size: Optional[int] = None,
+    max_row_size: Optional[int] = None,
+    parse: bool = False,
+    **kwargs,
+) -> Iterator[Any]:
+    """
+    Read a JSON array of rows from a stream chunk by chunk, e.g. a Django request or a file opened in binary mode, and
+    yield each row once it's validated against the spec, as validate_data_spec(..., multirow=True) does. Only one row
+    and one chunk are held in memory at a time, and the invalid or oversize input is raised before the rest of the
+    stream is read.
+
+    stream: a file-like object with read(size), or an iterable of bytes/str chunks
+    max_body_size: int or None, the maximum size of the stream in bytes (characters for str chunks)
+    max_row_size: int or None, the maximum size of a row in characters
+    parse: boolean, yield the rows parsed as parse_data_spec does
+    kwargs: the payload limits of validate_data_spec, i.e. max_rows, max_list_length, max_depth, max_str_size and
+            deadline, which default to the ones of dsv_feature(limits=...)
+    """
+    raise_if(chunk_size <= 0, ValueError(f'chunk_size must be positive, got {chunk_size}'))
+    _, ctx = _build_context((), spec, True, kwargs, parsing=parse)
+    max_rows = kwargs.get('max_rows', get_limits(spec).get('max_rows'))
+    plan = compile_spec(spec)
+    scanner = _RowScanner(max_row_size)
+
+    count = 0
+    for text, final in _iter_texts(stream, chunk_size, max_body_size):
+        for row_text in scanner.feed(text, final=final):
+            if max_rows is not None and count >= max_rows:
+                raise LimitExceededError(f'reason: number of rows exceeds max_rows({max_rows})')
+            try:
+                row = json.loads(row_text)
+            except JSONDecodeError as e:
+                raise scanner.decode_error(e.msg, scanner.start + e.pos) from None
+            if not isinstance(row, dict):
+                # Like validate_data_spec(..., multirow=True) does.
+                raise _incompatible_rows_error(spec)
+            ctx.depth = 1
+            ok, failures = _run_task(_iter_validate_spec(row, spec, plan, plan.field_keys, ctx))
+            if not ok:
+                raise _extract_error(spec, failures)
+            count += 1
+            yield ctx.parsed if parse else row
@@ -0,0 +1,97 @@
+from typing import Any, Dict, FrozenSet
+
+from .actions import validate_data_spec
+from .patch import _PatchTarget, _validate_targets
+from .utils import raise_if
+
+
+class ValidatedDict(dict):
+    """
+    A dict of data validated against a spec, which records the keys written or deleted afterwards, so that
+    revalidate() validates again only the fields of those keys, their COND_EXIST dependents, and the strict &
+    any_keys_set features when keys are added or removed.
+
+    Only the top-level keys are tracked, a value mutated in place, e.g. d['items'].append(...), has to be marked by
+    mark_changed('items').
+    """
+
+    def __init__(self, data, spec, **kwargs):
+        raise_if(
+            any(kwargs.get(key) for key in ('multirow', 'nothrow', 'partial')),
+            TypeError('ValidatedDict does not support the multirow, nothrow and partial kwargs'),
+        )
+        validate_data_spec(data, spec, **kwargs)
+        super().__init__(data)
+        self._spec = spec
+        self._kwargs = kwargs
+        self._changed = set()
+        self._structural = False
+
+    @property
+    def spec(self):
+        return self._spec
+
+    @property
+    def changed_keys(self) -> FrozenSet[str]:
+        return frozenset(self._changed)
+
+    def mark_changed(self, *keys: str):
+        self._changed.update(keys)
+
+    def _track(self, key, structural: bool):
+        self._changed.add(key)
+        self._structural = self._structural or structural
+
+    def __setitem__(self, key, value):
+        self._track(key, key not in self)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._track(key, True)
+
+    def pop(self, key, *args):
+        if key in self:
+            self._track(key, True)
+        return super().pop(key, *args)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._track(key, True)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        for key in self:
+            self._track(key, True)
+        super().clear()
+
+    def revalidate(self, nothrow: bool = False) -> bool:
+        """
+        Validate again the fields affected by the changes since the last successful validation, the changes are kept
+        when the validation fails. Raise an error like validate_data_spec, or return False if nothrow is True.
+        """
+        if not self._changed:
+            return True
+
+        target = _PatchTarget(self._spec, self, 0)
+        target.keys = set(self._changed)
+        target.structural = self._structural
+        kwargs: Dict[str, Any] = {**self._kwargs, 'nothrow': nothrow}
+        ok = _validate_targets(self, self._spec, [target], kwargs)
+        if ok:
+            self._changed.clear()
+            self._structural = False
+        return ok
@@ -1,15 +1,12 @@
-import copy
 import datetime
 import json
 import re
-import uuid
-from dataclasses import dataclass
-from decimal import Decimal
+import time
+import warnings
 from functools import lru_cache
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
-
-import dateutil.parser
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Iterable, List, Mapping, Optional, Tuple, Type, Union
 
+from .adaptive import AdaptiveStats
 from .checks import (
     _TYPE,
     AMOUNT,
@@ -38,34 +35,47 @@ from .checks import (
     REGEX,
     SPEC,
     STR,
+    UNION,
     UUID,
-    Checker,
+    get_compiled_config,
     get_validator,
 )
-from .defines import SELF, BaseValidator, ValidateResult
-from .features import get_any_keys_set, is_strict
+from .defines import (
+    SELF,
+    BaseValidator,
+    LimitExceededError,
+    UnsafePatternWarning,
+    ValidateResult,
+    ValidationTimeoutError,
+)
+from .features import get_adaptive_stats, get_feature_params
+from .plan import FieldKey, SpecPlan, compile_spec
+from .regex_guard import analyze_pattern, regex_guard
 from .utils import raise_if
 
+if TYPE_CHECKING:
+    import decimal
+    import uuid
+
 _ALLOW_UNKNOWN = 'ALLOW_UNKNOWN'
+_CONTEXT = '_context_'
+# The errors abort the whole validation instead of failing a check.
+_ABORT_ERRORS = (NotImplementedError, LimitExceededError, ValidationTimeoutError)
 _SPEC_WISE_CHECKS = [COND_EXIST]
+# The field value is kept as it is unless a passing check converts it.
+_UNPARSED = object()
 
 
 class UnknownFieldValue:
     message = 'This field cannot be found in this SPEC'
 
 
-@dataclass(frozen=True)
-class FieldKey:
-    spec_field: str
-    data_field: Optional[str] = None
-
-
 @lru_cache(1)
 def get_unknown_field_value() -> UnknownFieldValue:
     return UnknownFieldValue()
 
 
-def _extract_value(checks: list, data: dict, field_key: FieldKey):
+def _extract_value(checks: Tuple[str, ...], data: dict, field_key: FieldKey):
     if LIST_OF in checks and hasattr(data, 'getlist'):
         # For QueryDict, all query values are put into list for the same key.
         # It should be client side's (Spec maker) responsibility to indicate that
@@ -76,8 +86,9 @@ def _extract_value(checks: list, data: dict, field_key: FieldKey):
     return value
 
 
-def _makeup_internals_to_extra(spec: Type, checks: List[str], raw_extra: Dict, allow_optional: bool) -> Dict:
-    extra = copy.deepcopy(raw_extra)
+def _makeup_internals_to_extra(spec: Type, checks: Tuple[str, ...], raw_extra: Mapping, allow_optional: bool) -> Dict:
+    # Only the top-level keys are set, the configurations are read-only to the validators.
+    extra = raw_extra.copy()
     if extra.get(SpecValidator.name) == SELF:
         extra[SpecValidator.name] = spec
 
@@ -86,7 +97,7 @@ def _makeup_internals_to_extra(spec: Type, checks: List[str], raw_extra: Dict, a
     return extra
 
 
-def _pass_optional(allow_optional: bool, checks: List[str], value: Any) -> bool:
+def _pass_optional(allow_optional: bool, checks: Tuple[str, ...], value: Any) -> bool:
     return value == get_unknown_field_value() and allow_optional and COND_EXIST not in checks
 
 
@@ -98,7 +109,221 @@ def _pass_unknown(_extra: Dict, value: Any) -> bool:
     return value == get_unknown_field_value() and _ALLOW_UNKNOWN in _extra
 
 
-def _validate_field(data, field_key: FieldKey, spec) -> Tuple[bool, List[ValidateResult]]:
+class _ValidationContext:
+    """
+    The states shared by all the nested validations of one validate_data_spec call, carried in extra.
+    """
+
+    __slots__ = (
+        'max_depth',
+        'max_list_length',
+        'max_str_size',
+        'rows',
+        'deadline',
+        'deadline_at',
+        'depth',
+        'parsing',
+        'parsed',
+        'converting',
+        'conversions',
+        'partial_depth',
+    )
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_list_length: Optional[int] = None,
+        max_str_size: Optional[int] = None,
+        rows: Optional[Iterable] = None,
+        deadline: Optional[float] = None,
+        parsing: bool = False,
+        partial_depth: Optional[int] = None,
+    ):
+        self.max_depth = max_depth
+        self.max_list_length = max_list_length
+        self.max_str_size = max_str_size
+        # The multirow data, which is limited by max_rows instead of max_list_length.
+        self.rows = rows
+        self.deadline = deadline
+        self.deadline_at = time.monotonic() + deadline if deadline is not None else None
+        self.depth = 0
+        # The nested validations hand their parsed values over to the outer ones through parsed.
+        self.parsing = parsing
+        self.parsed = None
+        # The conversions of the value being validated, shared by the checks of a field.
+        self.converting = None
+        self.conversions = {}
+        # The depth of the spec validated partially, i.e. only the fields present in the data.
+        self.partial_depth = partial_depth
+
+    def convert(self, value, converter: Callable[[Any], Any]) -> Any:
+        if self.converting is not value:
+            self.converting, self.conversions = value, {}
+        conversions = self.conversions
+        if converter not in conversions:
+            try:
+                conversions[converter] = converter(value), None
+            except Exception as e:
+                conversions[converter] = None, e
+        converted, error = conversions[converter]
+        if error is not None:
+            raise error
+        return converted
+
+    def check_deadline(self):
+        if self.deadline_at is not None and time.monotonic() > self.deadline_at:
+            raise ValidationTimeoutError(f'Validation exceeds the deadline({self.deadline}s)')
+
+    def ensure_depth(self, spec):
+        if self.max_depth is not None and self.depth >= self.max_depth:
+            raise LimitExceededError(f'spec: {spec}, reason: maximum nesting depth({self.max_depth}) exceeded')
+
+    def enter_spec(self, spec):
+        self.ensure_depth(spec)
+        self.depth += 1
+
+    def leave_spec(self):
+        self.depth -= 1
+
+    def ensure_size(self, value, checks: Tuple[str, ...], where: str):
+        # Sizes known up front are checked before any traversal.
+        if self.max_str_size is not None and isinstance(value, (str, bytes)) and len(value) > self.max_str_size:
+            raise LimitExceededError(
+                f'field: {where}, reason: size of value({len(value)}) exceeds max_str_size({self.max_str_size})'
+            )
+        if (
+            self.max_list_length is not None
+            and (LIST_OF in checks or FOREACH in checks)
+            and value is not self.rows
+            and hasattr(value, '__len__')
+            and len(value) > self.max_list_length
+        ):
+            raise LimitExceededError(
+                f'field: {where}, reason: length of value({len(value)}) exceeds max_list_length({self.max_list_length})'
+            )
+
+    def guard_elements(self, values: Iterable) -> Iterable:
+        if self.deadline_at is None and (
+            values is self.rows or (self.max_list_length is None and self.max_str_size is None)
+        ):
+            return values
+        return self._iter_guarded_elements(values)
+
+    def _iter_guarded_elements(self, values: Iterable) -> Iterable:
+        # For the iterables of unknown size (e.g. FOREACH over a generator) and the elements of lists.
+        max_list_length = self.max_list_length if values is not self.rows else None
+        for idx, value in enumerate(values):
+            self.check_deadline()
+            if max_list_length is not None and idx >= max_list_length:
+                raise LimitExceededError(f'reason: number of elements exceeds max_list_length({max_list_length})')
+            if self.max_str_size is not None and isinstance(value, (str, bytes)) and len(value) > self.max_str_size:
+                raise LimitExceededError(
+                    f'reason: size of element({len(value)}) exceeds max_str_size({self.max_str_size})'
+                )
+            yield value
+
+
+def _get_context(extra: Dict) -> _ValidationContext:
+    return extra.get(_CONTEXT) or _ValidationContext()
+
+
+def convert_value(value, extra: Dict, converter: Callable[[Any], Any]) -> Any:
+    """
+    Return converter(value), e.g. convert_value(value, extra, float), computed at most once per value & converter
+    among the checks of a field, the exception raised by the converter is re-raised as well. The converter must be
+    a pure function, and the same function object has to be passed to share the result.
+    """
+    ctx = extra.get(_CONTEXT)
+    if ctx is None:
+        return converter(value)
+    return ctx.convert(value, converter)
+
+
+# The modules slow to import are imported by the conversions needing them, on their first use.
+def _to_decimal(value) -> 'decimal.Decimal':
+    import decimal
+
+    return decimal.Decimal(str(value))
+
+
+def _digits_to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        # The digits of str.isdigit which int() doesn't take, e.g. '²'.
+        import unicodedata
+
+        return int(''.join(str(unicodedata.digit(char)) for char in value))
+
+
+def _to_date(value) -> datetime.date:
+    import dateutil.parser
+
+    return dateutil.parser.parse(value).date()
+
+
+def _to_uuid(value) -> 'uuid.UUID':
+    import uuid
+
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+
+
+def _run_task(task: Generator):
+    """
+    Run a validation task without growing the Python stack with the data nesting.
+
+    A task is a generator which yields a sub-task (another generator) whenever it needs a nested validation, e.g. a
+    nested SPEC, and is resumed with the sub-task's return value, or with the exception raised by the sub-task.
+    """
+    stack = [task]
+    sent, thrown = None, None
+    while stack:
+        current = stack[-1]
+        try:
+            if thrown is not None:
+                sub_task = current.throw(thrown)
+            else:
+                sub_task = current.send(sent)
+        except StopIteration as stop:
+            stack.pop()
+            sent, thrown = stop.value, None
+            continue
+        except BaseException as e:
+            stack.pop()
+            if not stack:
+                raise
+            sent, thrown = None, e
+            continue
+        stack.append(sub_task)
+        sent, thrown = None, None
+    return sent
+
+
+def _map_validation_error(check: str, value: Any, spec, error: Exception) -> Tuple[bool, Exception]:
+    if isinstance(error, _ABORT_ERRORS):
+        raise error
+    if isinstance(error, AttributeError):
+        if check == LIST_OF:
+            # During list_of check, the target should be one kind of spec.
+            return False, TypeError(f'{repr(value)} is not a spec of {spec}, detail: {repr(error)}')
+        return False, RuntimeError(f'{repr(error)}')
+    # For any unwell-handled case, go this way for now.
+    return False, RuntimeError(f'{repr(error)}')
+
+
+def _overrides_normalize(validator: BaseValidator) -> bool:
+    return type(validator).normalize is not BaseValidator.normalize
+
+
+def _iter_validate_field(
+    data,
+    field_key: FieldKey,
+    spec,
+    ctx: _ValidationContext,
+    stats: Optional[AdaptiveStats] = None,
+    cleaned: Optional[Dict] = None,
+    cond_results: Optional[Dict] = None,
+) -> Generator:
     checker = getattr(spec, field_key.spec_field)
 
     checks = checker.checks
@@ -106,77 +331,160 @@ def _validate_field(data, field_key: FieldKey, spec) -> Tuple[bool, List[Validat
     allow_none = checker.allow_none
 
     value = _extract_value(checks, data, field_key)
-    extra = _makeup_internals_to_extra(spec, checks, checker.extra, allow_optional)
-
-    results = []
+    ctx.ensure_size(value, checks, f'{spec.__name__}.{field_key.data_field}')
 
     if _pass_optional(allow_optional, checks, value):
         # Skip all the other checks' validations
         return True, []
     elif _pass_none(allow_none, value):
         # Skip all the other checks' validations
+        if cleaned is not None:
+            cleaned[field_key.spec_field] = None
         return True, []
-    else:
 
-        def _do_validate(_acc_results: List, _spec: Any, _check: str, _value: Any, _data: Dict, _extra: Dict) -> None:
-            validator = get_validator(_check)
-            try:
-                ok, error = validator.validate(_value, _extra, _data)
-            except AttributeError as ae:
-                if _check == LIST_OF:
-                    # During list_of check, the target should be one kind of spec.
-                    ok, error = False, TypeError(f'{repr(_value)} is not a spec of {_spec}, detail: {repr(ae)}')
-                else:
-                    ok, error = False, RuntimeError(f'{repr(ae)}')
-            except NotImplementedError:
-                raise
-            except Exception as e:
-                # For any unwell-handled case, go this way for now.
-                ok, error = False, RuntimeError(f'{repr(e)}')
-            _acc_results.append((ok, ValidateResult(spec, field_key.data_field, _value, _check, error)))
-
-        spec_wise_checks = set(filter(lambda c: c in _SPEC_WISE_CHECKS, checks))
-        field_wise_checks = set(checks) - spec_wise_checks
+    extra = _makeup_internals_to_extra(spec, checks, checker.extra, allow_optional)
+    extra[_CONTEXT] = ctx
+
+    # The checks run in the declared order, which decides e.g. the parsed value of the first passing conversion, so they
+    # are not reordered adaptively when parsing.
+    unique_checks = list(dict.fromkeys(checks))
+    spec_wise_checks = [c for c in unique_checks if c in _SPEC_WISE_CHECKS]
+    field_wise_checks = [c for c in unique_checks if c not in _SPEC_WISE_CHECKS]
+
+    ordered_checks = list(spec_wise_checks)
+    if not _pass_unknown(extra, value):
+        if stats and cleaned is None:
+            ordered_checks += stats.order_checks(field_key.spec_field, field_wise_checks, checker.is_op_any)
+        else:
+            ordered_checks += field_wise_checks
 
-        for chk in spec_wise_checks:
-            _do_validate(results, spec, chk, value, data, extra)
+    results = []
+    parsed = _UNPARSED
+    for idx, chk in enumerate(ordered_checks):
+        validator = get_validator(chk)
+        # Nested validations, e.g. SPEC, are yielded as sub-tasks instead of being called recursively.
+        iter_validate = getattr(validator, 'iter_validate', None)
+        start = time.perf_counter() if stats else 0.0
+        try:
+            if chk == COND_EXIST and cond_results is not None:
+                # Evaluated for the whole spec at once.
+                ok, error = cond_results[field_key.spec_field]
+            elif iter_validate:
+                ok, error = yield iter_validate(value, extra, data)
+                if ok and cleaned is not None and parsed is _UNPARSED:
+                    parsed = ctx.parsed
+            else:
+                ok, error = validator.validate(value, extra, data)
+                if ok and cleaned is not None and parsed is _UNPARSED and _overrides_normalize(validator):
+                    parsed = validator.normalize(value, extra)
+        except Exception as e:
+            ok, error = _map_validation_error(chk, value, spec, e)
+        results.append((ok, ValidateResult(spec, field_key.data_field, value, chk, error)))
 
-        if not _pass_unknown(extra, value):
-            for chk in field_wise_checks:
-                _do_validate(results, spec, chk, value, data, extra)
+        if stats:
+            stats.record_check(field_key.spec_field, chk, bool(ok), time.perf_counter() - start)
+            # Fail-fast, stop at the first check deciding the result of the op.
+            if idx >= len(spec_wise_checks) and bool(ok) == checker.is_op_any:
+                break
 
     nok_results = [rs for (ok, rs) in results if not ok]
     if checker.is_op_any and len(nok_results) == len(checks):
         return False, nok_results
     if checker.is_op_all and nok_results:
         return False, nok_results
+    if cleaned is not None and not isinstance(value, UnknownFieldValue):
+        cleaned[field_key.spec_field] = value if parsed is _UNPARSED else parsed
     return True, []
 
 
-def _validate_spec_features(data, data_fields, spec) -> Tuple[bool, List[ValidateResult]]:
-    if is_strict(spec):
-        unexpected = set(data.keys()) - set(data_fields)
+def _validate_spec_features(data, spec, partial: bool = False) -> Tuple[bool, List[ValidateResult]]:
+    feat_params = get_feature_params(spec)
+    if feat_params is None:
+        return True, [ValidateResult()]
+
+    # The presence of fields is not required by a partial validation.
+    expected_keys, any_keys_groups = feat_params.expected_keys, () if partial else feat_params.any_keys_groups
+    if expected_keys is not None or any_keys_groups:
+        data_keys = data.keys()
+
+    if expected_keys is not None:
+        # A single pass over the data keys, the unexpected ones are reported in the payload order.
+        unexpected = [key for key in data_keys if key not in expected_keys]
         if unexpected:
             error = ValueError(f'Unexpected field keys({unexpected}) found in strict mode spec')
             return False, [ValidateResult(spec, str(unexpected), data, 'strict', error)]
 
-    any_keys_set = get_any_keys_set(spec)
-    if any_keys_set:
-        data_keys = set(data.keys())
-        for keys in any_keys_set:
-            if data_keys.isdisjoint(set(keys)):
-                str_keys = ", ".join(keys)
-                error = KeyError('At least one of these fields must exist')
-                return False, [ValidateResult(spec, str_keys, data, 'any_keys_set', error)]
+    for keys in any_keys_groups:
+        if not any(key in data_keys for key in keys):
+            str_keys = ", ".join(keys)
+            error = KeyError('At least one of these fields must exist')
+            return False, [ValidateResult(spec, str_keys, data, 'any_keys_set', error)]
 
     return True, [ValidateResult()]
 
 
-def _validate_spec_fields(data, field_keys: List[FieldKey], spec) -> List[Tuple[bool, List[ValidateResult]]]:
-    rs = [_validate_field(data, fk, spec) for fk in field_keys]
+def _iter_validate_fields_adaptively(
+    data,
+    field_keys: List[FieldKey],
+    spec,
+    ctx: _ValidationContext,
+    stats: AdaptiveStats,
+    cleaned: Optional[Dict],
+    cond_results: Optional[Dict],
+) -> Generator:
+    # The likely failing & cheap fields go first, and the validation stops at the first failure.
+    rs = []
+    for fk in stats.order_fields(field_keys):
+        ctx.check_deadline()
+        start = time.perf_counter()
+        result = yield from _iter_validate_field(data, fk, spec, ctx, stats, cleaned, cond_results)
+        stats.record_field(fk.spec_field, result[0], time.perf_counter() - start)
+        rs.append(result)
+        if not result[0]:
+            break
+    stats.tick()
     return rs
 
 
+def _iter_validate_spec(
+    value,
+    spec,
+    plan: SpecPlan,
+    field_keys: List[FieldKey],
+    ctx: _ValidationContext,
+    partial: bool = False,
+    with_features: bool = True,
+) -> Generator:
+    ctx.enter_spec(spec)
+    try:
+        if with_features:
+            result = _validate_spec_features(value, spec, partial)
+            if not result[0]:
+                return False, [result]
+
+        cleaned = {} if ctx.parsing else None
+        cond_results = plan.cond_exist.evaluate(value) if plan.cond_exist else None
+        stats = get_adaptive_stats(spec)
+        if stats is None:
+            results = []
+            for fk in field_keys:
+                ctx.check_deadline()
+                result = yield from _iter_validate_field(value, fk, spec, ctx, None, cleaned, cond_results)
+                results.append(result)
+        else:
+            results = yield from _iter_validate_fields_adaptively(
+                value, field_keys, spec, ctx, stats, cleaned, cond_results
+            )
+    finally:
+        ctx.leave_spec()
+    failures = [r for r in results if not r[0]]
+
+    ok = len(failures) == 0
+    if ok and cleaned is not None:
+        ctx.parsed = cleaned
+    return ok, failures
+
+
 class DummyValidator(BaseValidator):
     name = DUMMY
 
@@ -252,11 +560,15 @@ class JSONValidator(BaseValidator):
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
         try:
-            json.loads(value)
+            convert_value(value, extra, json.loads)
             return True, ''
         except Exception as e:
             return False, TypeError(f'{repr(value)} is not a json object, {e.__str__()}')
 
+    @staticmethod
+    def normalize(value, extra):
+        return convert_value(value, extra, json.loads)
+
 
 class JSONBoolValidator(BaseValidator):
     name = JSON_BOOL
@@ -264,12 +576,16 @@ class JSONBoolValidator(BaseValidator):
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
         try:
-            ok = type(json.loads(value)) is bool
+            ok = type(convert_value(value, extra, json.loads)) is bool
             info = '' if ok else TypeError(f'{repr(value)} is not a json boolean')
             return ok, info
         except Exception as e:
             return False, TypeError(f'{repr(value)} is not a json object, {e.__str__()}')
 
+    @staticmethod
+    def normalize(value, extra):
+        return convert_value(value, extra, json.loads)
+
 
 class ListValidator(BaseValidator):
     name = LIST
@@ -317,27 +633,36 @@ class AmountValidator(BaseValidator):
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
         try:
-            float(value)
+            convert_value(value, extra, float)
             return True, ''
         except ValueError:
             return False, ValueError(f'Cannot convert {repr(value)} to float')
 
+    @staticmethod
+    def normalize(value, extra):
+        try:
+            return convert_value(value, extra, _to_decimal)
+        except (ArithmeticError, ValueError):
+            # Accepted by float() only, e.g. True or b'1', the float validated is the amount.
+            return _to_decimal(convert_value(value, extra, float))
+
 
 class AmountRangeValidator(BaseValidator):
     name = AMOUNT_RANGE
 
     @staticmethod
-    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
-        amount_range_info = extra.get(AmountRangeValidator.name)
+    def compile_config(config) -> Tuple[Any, Any]:
         raise_if(
-            type(amount_range_info) != dict or ('min' not in amount_range_info and 'max' not in amount_range_info),
-            RuntimeError(f'Invalid checker configuration: {extra}'),
+            type(config) != dict or ('min' not in config and 'max' not in config),
+            TypeError(f'Invalid checker configuration: {AMOUNT_RANGE.upper()}={config!r}'),
         )
+        return config.get('min', float('-inf')), config.get('max', float('inf'))
 
-        lower_bound = amount_range_info.get('min', float('-inf'))
-        upper_bound = amount_range_info.get('max', float('inf'))
+    @staticmethod
+    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
+        lower_bound, upper_bound = get_compiled_config(extra, AmountRangeValidator)
 
-        ok = lower_bound <= float(value) <= upper_bound
+        ok = lower_bound <= convert_value(value, extra, float) <= upper_bound
         info = '' if ok else ValueError(f'Amount: {repr(value)} must be between {lower_bound} and {upper_bound}')
         return ok, info
 
@@ -346,18 +671,22 @@ class LengthValidator(BaseValidator):
     name = LENGTH
 
     @staticmethod
-    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
-        length_info = extra.get(LengthValidator.name)
+    def compile_config(config) -> Tuple[int, Optional[int]]:
         raise_if(
-            type(length_info) != dict or ('min' not in length_info and 'max' not in length_info),
-            RuntimeError(f'Invalid checker configuration: {extra}'),
+            type(config) != dict or ('min' not in config and 'max' not in config),
+            TypeError(f'Invalid checker configuration: {LENGTH.upper()}={config!r}'),
         )
 
-        lower_bound, upper_bound = length_info.get('min', 0), length_info.get('max')
+        lower_bound, upper_bound = config.get('min', 0), config.get('max')
         raise_if(
             lower_bound < 0,
-            RuntimeError('Lower boundary cannot less than 0 for length validator'),
+            ValueError('Lower boundary cannot less than 0 for length validator'),
         )
+        return lower_bound, upper_bound
+
+    @staticmethod
+    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
+        lower_bound, upper_bound = get_compiled_config(extra, LengthValidator)
 
         ok = lower_bound <= len(value) <= upper_bound if upper_bound else lower_bound <= len(value)
         info = '' if ok else ValueError(f'Length of {repr(value)} must be between {lower_bound} and {upper_bound}')
@@ -369,50 +698,55 @@ class SpecValidator(BaseValidator):
 
     @staticmethod
     def _extract_field_keys(spec) -> List[FieldKey]:
-        raise_if(type(spec) != type, RuntimeError(f'{spec} should be a spec class'))
-
-        fields = []
-        for f_name, checker in spec.__dict__.items():
-            if isinstance(checker, Checker):
-                key = FieldKey(spec_field=f_name, data_field=checker.alias if checker.alias else f_name)
-                fields.append(key)
-
-        return fields
+        return compile_spec(spec).field_keys
 
     @staticmethod
-    def validate(value, extra, data) -> Tuple[bool, List[Tuple[bool, List[ValidateResult]]]]:
+    def iter_validate(value, extra, data) -> Generator:
         target_spec = extra.get(SpecValidator.name)
+        ctx = _get_context(extra)
 
-        field_keys = SpecValidator._extract_field_keys(target_spec)
+        plan = compile_spec(target_spec)
+        partial = ctx.partial_depth == ctx.depth and hasattr(value, 'keys')
+        # The absent fields pass as optional ones, so only the present ones are walked.
+        field_keys = plan.present_field_keys(value) if partial else plan.field_keys
+        return (yield from _iter_validate_spec(value, target_spec, plan, field_keys, ctx, partial=partial))
 
-        result = _validate_spec_features(value, [fk.data_field for fk in field_keys], target_spec)
-        if not result[0]:
-            return False, [result]
-
-        results = _validate_spec_fields(value, field_keys, target_spec)
-        failures = [r for r in results if not r[0]]
-
-        ok = len(failures) == 0
-        return ok, failures
+    @staticmethod
+    def validate(value, extra, data) -> Tuple[bool, List[Tuple[bool, List[ValidateResult]]]]:
+        return _run_task(SpecValidator.iter_validate(value, extra, data))
 
 
 class ListOfValidator(BaseValidator):
     name = LIST_OF
 
     @staticmethod
-    def validate(values, extra, data) -> Tuple[bool, Union[Exception, str]]:
+    def iter_validate(values, extra, data) -> Generator:
         if type(values) != list:
             return False, TypeError('Must a be in type: list')
 
         check = extra.get(ListOfValidator.name)
         validator = get_validator(check)
-        for value in values:
-            ok, error = validator.validate(value, extra, data)
+        iter_validate = getattr(validator, 'iter_validate', None)
+        ctx = _get_context(extra)
+        parsed = [] if ctx.parsing else None
+        for value in ctx.guard_elements(values):
+            if iter_validate:
+                ok, error = yield iter_validate(value, extra, data)
+            else:
+                ok, error = validator.validate(value, extra, data)
             if not ok:
                 # Early return to save lives.
                 return False, error
+            if parsed is not None:
+                parsed.append(ctx.parsed if iter_validate else validator.normalize(value, extra))
+        if parsed is not None:
+            ctx.parsed = parsed
         return True, ''
 
+    @staticmethod
+    def validate(values, extra, data) -> Tuple[bool, Union[Exception, str]]:
+        return _run_task(ListOfValidator.iter_validate(values, extra, data))
+
 
 class OneOfValidator(BaseValidator):
     name = ONE_OF
@@ -429,16 +763,30 @@ class ForeachValidator(BaseValidator):
     name = FOREACH
 
     @staticmethod
-    def validate(values: Iterable, extra: Dict, data: Dict) -> Tuple[bool, Union[Exception, str]]:
+    def iter_validate(values: Iterable, extra: Dict, data: Dict) -> Generator:
         check = extra.get(ForeachValidator.name)
         validator = get_validator(check)
-        for value in values:
-            ok, error = validator.validate(value, extra, data)
+        iter_validate = getattr(validator, 'iter_validate', None)
+        ctx = _get_context(extra)
+        parsed = [] if ctx.parsing else None
+        for value in ctx.guard_elements(values):
+            if iter_validate:
+                ok, error = yield iter_validate(value, extra, data)
+            else:
+                ok, error = validator.validate(value, extra, data)
             if not ok:
                 # Early return to save lives.
                 return False, error
+            if parsed is not None:
+                parsed.append(ctx.parsed if iter_validate else validator.normalize(value, extra))
+        if parsed is not None:
+            ctx.parsed = parsed
         return True, ''
 
+    @staticmethod
+    def validate(values: Iterable, extra: Dict, data: Dict) -> Tuple[bool, Union[Exception, str]]:
+        return _run_task(ForeachValidator.iter_validate(values, extra, data))
+
 
 class DecimalPlaceValidator(BaseValidator):
     name = DECIMAL_PLACE
@@ -446,13 +794,17 @@ class DecimalPlaceValidator(BaseValidator):
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
         dp_info = extra.get(DecimalPlaceValidator.name)
-        dv = Decimal(str(value))
+        dv = convert_value(value, extra, _to_decimal)
         dv_tup = dv.as_tuple()
         dv_dp = -1 * dv_tup.exponent if dv_tup.exponent < 0 else 0
         ok = dv_dp <= dp_info
         info = '' if ok else ValueError(f'Expect decimal places({dp_info}) for value: {value!r}, ' f'but got {dv_dp}')
         return ok, info
 
+    @staticmethod
+    def normalize(value, extra):
+        return convert_value(value, extra, _to_decimal)
+
 
 class DateValidator(BaseValidator):
     name = DATE
@@ -460,33 +812,38 @@ class DateValidator(BaseValidator):
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
         try:
-            dateutil.parser.parse(value).date()
+            convert_value(value, extra, _to_date)
             return True, ''
         except ValueError:
             return False, ValueError(f'Unexpected date format: {repr(value)}')
 
+    @staticmethod
+    def normalize(value, extra):
+        return convert_value(value, extra, _to_date)
+
 
 class DateRangeValidator(BaseValidator):
     name = DATE_RANGE
 
     @staticmethod
-    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
-        range_info = extra.get(DateRangeValidator.name)
+    def compile_config(config) -> Tuple[datetime.date, datetime.date, str, str]:
         raise_if(
-            type(range_info) != dict or ('min' not in range_info and 'max' not in range_info),
-            RuntimeError(f'Invalid checker configuration: {extra}'),
+            type(config) != dict or ('min' not in config and 'max' not in config),
+            TypeError(f'Invalid checker configuration: {DATE_RANGE.upper()}={config!r}'),
         )
 
-        min_date_str = range_info.get('min', '1970-01-01')
-        max_date_str = range_info.get('max', '2999-12-31')
+        min_date_str = config.get('min', '1970-01-01')
+        max_date_str = config.get('max', '2999-12-31')
         raise_if(
             type(min_date_str) != str or type(max_date_str) != str,
-            RuntimeError(f'Invalid checker configuration(must be str): {extra}'),
+            TypeError(f'Invalid checker configuration(must be str): {DATE_RANGE.upper()}={config!r}'),
         )
+        return _to_date(min_date_str), _to_date(max_date_str), min_date_str, max_date_str
 
-        min_date = dateutil.parser.parse(min_date_str).date()
-        max_date = dateutil.parser.parse(max_date_str).date()
-        value_date = dateutil.parser.parse(value).date()
+    @staticmethod
+    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
+        min_date, max_date, min_date_str, max_date_str = get_compiled_config(extra, DateRangeValidator)
+        value_date = convert_value(value, extra, _to_date)
         ok = min_date <= value_date <= max_date
         info = '' if ok else ValueError(f'{repr(value)} is not in range {min_date_str} ~ {max_date_str}')
         return ok, info
@@ -501,6 +858,10 @@ class DigitStrValidator(BaseValidator):
         info = '' if ok else TypeError(f'{repr(value)} is not a digit str')
         return ok, info
 
+    @staticmethod
+    def normalize(value, extra):
+        return convert_value(value, extra, _digits_to_int)
+
 
 class EmailValidator(BaseValidator):
     name = EMAIL
@@ -521,47 +882,135 @@ class UUIDValidator(BaseValidator):
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
         try:
-            if not isinstance(value, uuid.UUID):
-                uuid.UUID(value)
+            convert_value(value, extra, _to_uuid)
             return True, ''
         except Exception as e:
             return False, ValueError(f'{repr(value)} is not an UUID object: {e.__str__}')
 
+    @staticmethod
+    def normalize(value, extra):
+        return convert_value(value, extra, _to_uuid)
+
 
 class RegexValidator(BaseValidator):
     name = REGEX
 
     @staticmethod
-    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
-        regex_param = extra.get(RegexValidator.name, {})
+    def compile_config(config) -> Tuple[Any, str, Optional[int], Optional[float], Dict]:
+        regex_param = {} if config is None else config
+        raise_if(type(regex_param) != dict, TypeError(f'REGEX must be a dict, but got {regex_param!r}'))
         pattern = regex_param.get('pattern', '')
         match_method = regex_param.get('method', 'search')
+        raise_if(
+            match_method not in ('match', 'fullmatch', 'search'),
+            ValueError(f'unsupported match method: {match_method}'),
+        )
+
+        max_length, timeout = regex_param.get('max_length'), regex_param.get('timeout')
+        raise_if(
+            max_length is not None and (type(max_length) != int or max_length < 0),
+            TypeError(f'REGEX max_length must be a non-negative int or None, but got {max_length!r}'),
+        )
+        raise_if(
+            timeout is not None and (type(timeout) not in (int, float) or timeout <= 0),
+            TypeError(f'REGEX timeout must be a positive number of seconds or None, but got {timeout!r}'),
+        )
+
+        issues = analyze_pattern(pattern)
+        if issues and timeout is None:
+            warnings.warn(
+                UnsafePatternWarning(
+                    f'[DSV][WARNING] REGEX pattern {pattern!r} is prone to catastrophic backtracking '
+                    f'({", ".join(issues)}), consider rewriting it or guarding it by a timeout'
+                ),
+                # Point to where the Checker is built.
+                stacklevel=5,
+            )
+
         error_regex_param = regex_param.copy()
         error_regex_param['method'] = match_method
+        return re.compile(pattern), match_method, max_length, timeout, error_regex_param
 
-        if match_method == 'match':
-            match_func = re.match
-        elif match_method == 'fullmatch':
-            match_func = re.fullmatch
-        elif match_method == 'search':
-            match_func = re.search
-        else:
-            raise RuntimeError(f'unsupported match method: {match_method}')
+    @staticmethod
+    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
+        pattern, match_method, max_length, timeout, error_regex_param = get_compiled_config(extra, RegexValidator)
+
+        if type(value) != str:
+            return False, ValueError(f'{repr(value)} does not match "{error_regex_param}"')
 
-        ok = type(value) == str and match_func and match_func(pattern, value)
+        if max_length is not None and len(value) > max_length:
+            return False, ValueError(f'length of value({len(value)}) exceeds max_length({max_length}) of REGEX')
+
+        if timeout is None:
+            ok = getattr(pattern, match_method)(value)
+        else:
+            try:
+                ok = regex_guard.match(match_method, pattern, value, timeout)
+            except TimeoutError as timeout_err:
+                return False, ValueError(str(timeout_err))
         info = '' if ok else ValueError(f'{repr(value)} does not match "{error_regex_param}"')
         return ok, info
 
 
+class UnionValidator(BaseValidator):
+    name = UNION
+
+    @staticmethod
+    def compile_config(config) -> Dict:
+        raise_if(
+            type(config) != dict or 'tag' not in config or type(config.get('specs')) != dict,
+            TypeError(f'Invalid checker configuration: {UNION.upper()}={config!r}'),
+        )
+        return config
+
+    @staticmethod
+    def iter_validate(value, extra, data) -> Generator:
+        union_info = get_compiled_config(extra, UnionValidator)
+
+        if not hasattr(value, 'get'):
+            return False, TypeError(f'{repr(value)} is not a dict')
+
+        tag_field, specs = union_info['tag'], union_info['specs']
+        tag = value.get(tag_field, get_unknown_field_value())
+        if isinstance(tag, UnknownFieldValue):
+            return False, LookupError(f'tag field: {tag_field} missing')
+
+        # Only the branch picked by the tag is validated, instead of trying every spec.
+        try:
+            target_spec = specs.get(tag)
+        except TypeError:
+            target_spec = None
+        if target_spec is None:
+            return False, ValueError(f'{repr(tag)} is not one of {list(specs.keys())}')
+        result = yield SpecValidator.iter_validate(
+            value, {SpecValidator.name: target_spec, _CONTEXT: extra.get(_CONTEXT)}, data
+        )
+        return result
+
+    @staticmethod
+    def validate(value, extra, data) -> Tuple[bool, Union[Exception, str, List[Tuple[bool, List[ValidateResult]]]]]:
+        return _run_task(UnionValidator.iter_validate(value, extra, data))
+
+
 class CondExistValidator(BaseValidator):
     name = COND_EXIST
 
+    @staticmethod
+    def compile_config(config) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        params = {} if config is None else config
+        raise_if(type(params) != dict, TypeError(f'Invalid checker configuration: {COND_EXIST.upper()}={config!r}'))
+        must_with_keys, must_without_keys = params.get('WITH', []), params.get('WITHOUT', [])
+        raise_if(
+            not isinstance(must_with_keys, (list, tuple)) or not isinstance(must_without_keys, (list, tuple)),
+            TypeError(f'Invalid checker configuration(must be lists): {COND_EXIST.upper()}={config!r}'),
+        )
+        return tuple(must_with_keys), tuple(must_without_keys)
+
     @staticmethod
     def validate(value, extra, data) -> Tuple[bool, Union[Exception, str]]:
+        # The fields of a spec are validated by the COND_EXIST graph of the spec plan at once, see plan.py.
         allow_unknown = extra.get(_ALLOW_UNKNOWN, False)
-        params = extra.get(CondExistValidator.name, {})
-        must_with_keys = params.get('WITH', [])
-        must_without_keys = params.get('WITHOUT', [])
+        must_with_keys, must_without_keys = get_compiled_config(extra, CondExistValidator)
 
         if isinstance(value, UnknownFieldValue) and not allow_unknown:
             return False, LookupError('must exist')
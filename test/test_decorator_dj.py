@@ -1,13 +1,28 @@
+import importlib
 import itertools
 import json
 import unittest
+import warnings
 from unittest.mock import patch
 
 from parameterized import parameterized, parameterized_class
 
-from data_spec_validator.decorator import dsv, dsv_request_meta
+from data_spec_validator.decorator import compile_view_specs, dsv, dsv_request, dsv_request_meta
 from data_spec_validator.decorator.decorators import ParseError
-from data_spec_validator.spec import DIGIT_STR, LIST_OF, ONE_OF, STR, Checker, dsv_feature
+from data_spec_validator.spec import (
+    DIGIT_STR,
+    LIST_OF,
+    ONE_OF,
+    SELF,
+    SPEC,
+    STR,
+    Checker,
+    Source,
+    custom_spec,
+    dsv_feature,
+    validate_data_spec,
+)
+from data_spec_validator.spec.validators import BaseValidator
 
 from .utils import is_django_installed, make_request
 
@@ -17,6 +32,7 @@ try:
     from django.core.handlers.wsgi import WSGIRequest
     from django.http import HttpResponse, HttpResponseBadRequest
     from django.test import RequestFactory
+    from django.urls import include, path
     from django.views import View
 
     settings.configure()
@@ -199,6 +215,316 @@ class TestDSVDJ(unittest.TestCase):
         with patch('data_spec_validator.decorator.decorators._is_data_type_list', return_value=False):
             view.decorated_func(fake_request, **kwargs)
 
+    def test_payload_limits(self):
+        # arrange
+        payload = [{'test_a': 'TEST A1'}, {'test_a': 'TEST A2'}, {'test_a': 'TEST A3'}]
+        fake_request = make_request(self.request_class, method='POST', data=payload)
+
+        @dsv_feature(limits=dict(max_rows=2))
+        class _ViewSingleRowSpec:
+            test_a = Checker([STR])
+
+        class _View(View):
+            @dsv(_ViewSingleRowSpec, multirow=True)
+            def decorated_func(self, request, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        view = _View(request=fake_request)
+
+        # action
+        resp = view.decorated_func(fake_request)
+
+        # assert
+        self.assertEqual(resp.status_code, 400)
+
+    @parameterized.expand(
+        [
+            '{"items": [{"price": "1.5"}]}',
+            '[{"items": []}, {"items": [{"price": "2.5"}]}]',
+            # The value of a duplicate key is validated as well.
+            '{"items": [{"price": "1"}], "items": [{"price": "1.5"}]}',
+        ]
+    )
+    def test_json_body_decoded_with_spec(self, body):
+        # arrange
+        class _ItemSpec:
+            price = Checker([DIGIT_STR])
+
+        class _ViewSpec:
+            items = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+
+        class _View(View):
+            @dsv(_ViewSpec)
+            def decorated_func(self, request, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        valid_req = make_request(self.request_class, method='POST', data=body.replace('.5', '').encode(), is_json=True)
+        invalid_req = make_request(self.request_class, method='POST', data=body.encode(), is_json=True)
+
+        # action & assert
+        self.assertEqual(_View(request=valid_req).decorated_func(valid_req).status_code, 200)
+        self.assertEqual(_View(request=invalid_req).decorated_func(invalid_req).status_code, 400)
+
+    def test_deeply_nested_json_body(self):
+        # arrange
+        class _NodeSpec:
+            name = Checker([STR])
+            next = Checker([SPEC], optional=True, SPEC=SELF)
+
+        class _View(View):
+            @dsv(_NodeSpec)
+            def decorated_func(self, request, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        body = '{"name": "x", "next": ' * 600 + '{"name": "y"}' + '}' * 600
+        valid_req = make_request(self.request_class, method='POST', data=body.encode(), is_json=True)
+        invalid_req = make_request(
+            self.request_class, method='POST', data=body.replace('"y"', '1').encode(), is_json=True
+        )
+
+        # action
+        invalid_resp = _View(request=invalid_req).decorated_func(invalid_req)
+
+        # assert
+        self.assertEqual(_View(request=valid_req).decorated_func(valid_req).status_code, 200)
+        self.assertEqual(invalid_resp.status_code, 400)
+        self.assertNotIn(b'recursion', invalid_resp.content)
+
+    @parameterized.expand(['POST', 'PUT', 'PATCH', 'DELETE'])
+    def test_fields_read_from_their_sources(self, method):
+        # arrange
+        payload = json.dumps({'q_a': 'from body', 'b_a': 'B'}).encode('utf-8')
+        headers = {'HTTP_X_TOKEN': 'TOKEN'}
+
+        @dsv_feature(strict=True)
+        class _ViewSpec:
+            q_a = Checker([LIST_OF], LIST_OF=STR, source=Source.QUERY)
+            b_a = Checker([ONE_OF], ONE_OF='B', source=Source.BODY)
+            p_a = Checker([ONE_OF], ONE_OF='P', source=Source.PATH)
+            x_token = Checker([ONE_OF], ONE_OF='TOKEN', source=Source.HEADER)
+
+        class _QuerySpec:
+            q_a = Checker([ONE_OF], ONE_OF='3', source=Source.QUERY)
+
+        class _View(View):
+            @dsv(_ViewSpec)
+            def decorated_func(self, req, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+            @dsv(_QuerySpec)
+            def query_func(self, req, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        fake_request = make_request(
+            self.request_class, method=method, data=payload, qs='q_a=3', headers=headers, is_json=True
+        )
+        view = _View(request=fake_request)
+
+        # action & assert
+        self.assertEqual(view.decorated_func(fake_request, p_a='P').status_code, 200)
+        self.assertEqual(view.decorated_func(fake_request, p_a='Q').status_code, 400)
+
+        # The body is never parsed when no field is read from it.
+        invalid_request = make_request(
+            self.request_class, method=method, data=b'invalid json', qs='q_a=3', is_json=True
+        )
+        view = _View(request=invalid_request)
+        self.assertEqual(view.query_func(invalid_request).status_code, 200)
+        self.assertEqual(view.decorated_func(invalid_request, p_a='P').status_code, 400)
+
+        with self.assertRaises(TypeError):
+            dsv(_QuerySpec, multirow=True)
+
+    def test_named_params_overlaid_on_rows(self):
+        # arrange
+        payload = [{'test_a': 'TEST A1'}, {'test_a': 'TEST A2'}]
+        fake_request = make_request(self.request_class, method='POST', data=payload)
+
+        class _ViewSingleRowSpec:
+            test_a = Checker([STR])
+            test_b = Checker([ONE_OF], ONE_OF='TEST_B')
+
+        class _View(View):
+            @dsv(_ViewSingleRowSpec)
+            def decorated_func(self, request, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        view = _View(request=fake_request)
+
+        # action
+        with patch('data_spec_validator.decorator.decorators.validate_data_spec', side_effect=validate_data_spec) as v:
+            resp = view.decorated_func(fake_request, test_b='TEST_B')
+            validated = v.call_args[0][0]
+
+        # assert
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([row.get('test_b') for row in validated], ['TEST_B', 'TEST_B'])
+        # The rows are read through, not copied.
+        self.assertEqual(payload, [{'test_a': 'TEST A1'}, {'test_a': 'TEST A2'}])
+        self.assertEqual(view.decorated_func(fake_request, test_b='TEST_C').status_code, 400)
+        with self.assertRaises(RuntimeError):
+            view.decorated_func(fake_request, test_a='TEST A1')
+
+    def test_named_params_overlay_as_mapping(self):
+        # arrange
+        class _ItemsValidator(BaseValidator):
+            name = 'overlay_items'
+
+            @staticmethod
+            def validate(value, extra, data):
+                items = sorted(data.items())
+                ok = items == [('test_a', 'A'), ('test_b', 'B')] and dict(data) == dict(items)
+                return ok and sorted(data.values()) == ['A', 'B'], ValueError(f'unexpected items {items}')
+
+        with warnings.catch_warnings():
+            # Registered again by the test of each request class.
+            warnings.simplefilter('ignore')
+            custom_spec.register(dict(overlay_items=_ItemsValidator()))
+
+        class _ViewSpec:
+            test_a = Checker(['overlay_items'])
+            test_b = Checker([STR])
+
+        class _View(View):
+            @dsv(_ViewSpec)
+            def decorated_func(self, request, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        for data in ({'test_a': 'A'}, [{'test_a': 'A'}]):
+            fake_request = make_request(self.request_class, method='POST', data=data)
+            view = _View(request=fake_request)
+
+            # action
+            resp = view.decorated_func(fake_request, test_b='B')
+
+            # assert
+            self.assertEqual(resp.status_code, 200)
+
+    def test_request_meta_with_normalized_headers(self):
+        # arrange
+        headers = {'HTTP_X_API_KEY': 'KEY', 'CONTENT_TYPE': 'text/plain'}
+        fake_request = make_request(self.request_class, method='GET', headers=headers)
+
+        @dsv_feature(strict=True)
+        class _MetaSpec:
+            x_api_key = Checker([ONE_OF], ONE_OF='KEY')
+            content_type = Checker([ONE_OF], ONE_OF='text/plain', alias='Content-Type')
+            user_id = Checker([DIGIT_STR])
+
+        class _View(View):
+            @dsv_request_meta(_MetaSpec, normalize_headers=True)
+            def decorated_func(self, req, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        view = _View(request=fake_request)
+
+        # action & assert
+        # The other headers of META are not the keys of a strict spec.
+        self.assertEqual(view.decorated_func(fake_request, user_id='1').status_code, 200)
+        self.assertEqual(view.decorated_func(fake_request, user_id='a').status_code, 400)
+        fake_request.META['HTTP_X_API_KEY'] = 'OTHER'
+        self.assertEqual(view.decorated_func(fake_request, user_id='1').status_code, 400)
+        del fake_request.META['HTTP_X_API_KEY']
+        self.assertEqual(view.decorated_func(fake_request, user_id='1').status_code, 400)
+
+    def test_request_data_and_meta_validated_together(self):
+        # arrange
+        payload = {'test_a': 'TEST A'}
+        headers = {'HTTP_X_API_KEY': 'KEY'}
+
+        class _DataSpec:
+            test_a = Checker([ONE_OF], ONE_OF='TEST A')
+
+        class _MetaSpec:
+            x_api_key = Checker([ONE_OF], ONE_OF='KEY')
+
+        class _View(View):
+            @dsv_request(_DataSpec, meta_spec=_MetaSpec, normalize_headers=True)
+            def decorated_func(self, req, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        @dsv_request(meta_spec=_MetaSpec, normalize_headers=True)
+        def non_view_func(_arg, req):
+            return HttpResponse(status=200)
+
+        valid_req = make_request(self.request_class, method='GET', data=payload, headers=headers)
+        invalid_data_req = make_request(self.request_class, method='GET', data={'test_a': 'B'}, headers=headers)
+        invalid_meta_req = make_request(self.request_class, method='GET', data=payload)
+
+        # action & assert
+        view = _View(request=valid_req)
+        self.assertEqual(view.decorated_func(valid_req).status_code, 200)
+        # The request of the view is located the same way for the following calls.
+        view = _View(request=invalid_data_req)
+        self.assertEqual(view.decorated_func(invalid_data_req).status_code, 400)
+        view = _View(request=invalid_meta_req)
+        self.assertEqual(view.decorated_func(invalid_meta_req).status_code, 400)
+
+        self.assertEqual(non_view_func(None, valid_req).status_code, 200)
+        self.assertEqual(non_view_func(None, invalid_meta_req).status_code, 400)
+        with self.assertRaises(RuntimeError):
+            non_view_func(None, None)
+
+        with self.assertRaises(TypeError):
+            dsv_request()
+
+    def test_specs_compiled_when_decorated(self):
+        # arrange
+        class _NestedSpec:
+            b = Checker([STR])
+
+        class _ViewSpec:
+            a = Checker([SPEC], SPEC=_NestedSpec)
+
+        class _MetaSpec:
+            c = Checker([STR])
+
+        class _View(View):
+            @dsv(_ViewSpec)
+            @dsv_request_meta(_MetaSpec)
+            def get(self, req, *_args, **_kwargs):
+                return HttpResponse(status=200)
+
+        @dsv(_NestedSpec)
+        def func_view(req):
+            return HttpResponse(status=200)
+
+        # assert
+        self.assertIn('__dsv_plan__', vars(_NestedSpec))
+        self.assertIn('__dsv_plan__', vars(_MetaSpec))
+        self.assertEqual(_View.get.__dsv_specs__, (_MetaSpec, _ViewSpec))
+
+        # action
+        for spec in (_NestedSpec, _ViewSpec, _MetaSpec):
+            delattr(spec, '__dsv_plan__')
+
+        class _NestedURLConf:
+            urlpatterns = [path('func/', func_view)]
+
+        class _URLConf:
+            urlpatterns = [path('view/', _View.as_view()), path('nested/', include(_NestedURLConf))]
+
+        count = compile_view_specs(_URLConf)
+
+        # assert
+        self.assertEqual(count, 3)
+        for spec in (_NestedSpec, _ViewSpec, _MetaSpec):
+            self.assertIn('__dsv_plan__', vars(spec))
+
+    def test_app_config_before_django_3_2(self):
+        import data_spec_validator.decorator as dsv_decorator
+
+        # action
+        with patch('django.VERSION', (3, 1, 0, 'final', 0)):
+            importlib.reload(dsv_decorator)
+        app_config = dsv_decorator.default_app_config
+        del dsv_decorator.default_app_config
+        importlib.reload(dsv_decorator)
+
+        # assert
+        self.assertEqual(app_config, 'data_spec_validator.decorator.apps.DSVConfig')
+        self.assertFalse(hasattr(dsv_decorator, 'default_app_config'))
+
     def test_non_view_request(self):
         # arrange
         class _NonViewSpec:
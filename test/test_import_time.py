@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# The modules slow to import, which are imported by the validators needing them on their first use.
+LAZY_MODULES = ('dateutil.parser', 'decimal', 'multiprocessing', 'pickle', 'tempfile', 'uuid')
+# The budget of importing data_spec_validator.spec, in milliseconds.
+IMPORT_BUDGET_MS = float(os.environ.get('DSV_IMPORT_BUDGET_MS', 100))
+
+
+def _import_times(module: str):
+    # Return the cumulative import time of each module imported, in microseconds, by python -X importtime.
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:') :].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_modules_imported_lazily(self):
+        times = _import_times('data_spec_validator.spec')
+        self.assertEqual([module for module in LAZY_MODULES if module in times], [])
+
+    def test_import_time_budget(self):
+        elapsed_ms = min(_import_times('data_spec_validator.spec')['data_spec_validator.spec'] for _ in range(3)) / 1000
+        self.assertLess(elapsed_ms, IMPORT_BUDGET_MS)
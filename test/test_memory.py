@@ -0,0 +1,45 @@
+import gc
+import tracemalloc
+import unittest
+
+from data_spec_validator.spec import DIGIT_STR, LIST_OF, ONE_OF, REGEX, STR, Checker, compile_spec, validate_data_spec
+
+# The memory budget of a generated spec, the class itself included, in bytes.
+SPEC_MEMORY_BUDGET = 5 * 1024
+
+
+def _generate_specs(count: int):
+    return [
+        type(
+            f'_Spec{idx}',
+            (),
+            dict(
+                id=Checker([DIGIT_STR]),
+                name=Checker([STR], optional=True),
+                tags=Checker([LIST_OF], LIST_OF=STR, optional=True),
+                state=Checker([ONE_OF], ONE_OF=['draft', 'published', 'archived']),
+                code=Checker([REGEX], REGEX=dict(pattern=r'^[A-Z]{3}$')),
+                ref=Checker([STR], alias=f'ref_{idx % 100}'),
+            ),
+        )
+        for idx in range(count)
+    ]
+
+
+class TestSpecMemory(unittest.TestCase):
+    def test_memory_of_10k_specs(self):
+        # The specs of a large service share their identical Checkers and field keys.
+        gc.collect()
+        tracemalloc.start()
+        try:
+            specs = _generate_specs(10000)
+            for spec in specs:
+                compile_spec(spec)
+            gc.collect()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(size / len(specs), SPEC_MEMORY_BUDGET)
+        self.assertIs(specs[0].state, specs[-1].state)
+        self.assertTrue(validate_data_spec(dict(id='1', state='draft', code='ABC', ref_99='a'), specs[-1]))
@@ -1,6 +1,21 @@
+import sys
 import unittest
 
-from data_spec_validator.spec import BOOL, DICT, DIGIT_STR, FLOAT, INT, NONE, SPEC, STR, Checker, validate_data_spec
+from data_spec_validator.spec import (
+    BOOL,
+    DICT,
+    DIGIT_STR,
+    FLOAT,
+    INT,
+    LIST_OF,
+    NONE,
+    SELF,
+    SPEC,
+    STR,
+    Checker,
+    LimitExceededError,
+    validate_data_spec,
+)
 
 from .utils import is_something_error
 
@@ -61,3 +76,40 @@ class TestNestedSpec(unittest.TestCase):
             c3_f=[],
         )
         assert is_something_error(TypeError, validate_data_spec, nok_data, NestedSpec)
+
+    @staticmethod
+    def _get_tree_spec_and_data(depth):
+        class TreeSpec:
+            name = Checker([STR])
+            child = Checker([SPEC], optional=True, SPEC=SELF)
+            children = Checker([LIST_OF], optional=True, LIST_OF=SPEC, SPEC=SELF)
+
+        root = node = dict(name='root')
+        for idx in range(depth):
+            child = dict(name=f'node_{idx}')
+            if idx % 2:
+                node['child'] = child
+            else:
+                node['children'] = [dict(name='leaf'), child]
+            node = child
+        return TreeSpec, root, node
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 2
+        tree_spec, data, leaf = self._get_tree_spec_and_data(depth)
+        assert validate_data_spec(data, tree_spec)
+
+        leaf['name'] = 1
+        with self.assertRaises(TypeError) as ctx:
+            validate_data_spec(data, tree_spec)
+        assert 'TreeSpec.name' in str(ctx.exception)
+
+    def test_max_depth(self):
+        tree_spec, data, _ = self._get_tree_spec_and_data(10)
+        assert validate_data_spec(data, tree_spec, max_depth=11)
+
+        with self.assertRaises(LimitExceededError):
+            validate_data_spec(data, tree_spec, max_depth=10)
+        assert not validate_data_spec(data, tree_spec, max_depth=10, nothrow=True)
+        assert validate_data_spec([data, data], tree_spec, multirow=True, max_depth=11)
+        assert is_something_error(ValueError, validate_data_spec, [data], tree_spec, multirow=True, max_depth=10)
@@ -1,8 +1,20 @@
+import copy
 import datetime
+import gc
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
 import unittest
 import uuid
+import warnings
 from datetime import date
+from decimal import Decimal
 from itertools import chain
+from unittest.mock import patch
 
 from data_spec_validator.spec import (
     AMOUNT,
@@ -31,17 +43,41 @@ from data_spec_validator.spec import (
     SELF,
     SPEC,
     STR,
+    UNION,
     UUID,
     Checker,
     CheckerOP,
     DSVError,
     ErrorMode,
+    LimitExceededError,
+    Source,
+    SpecConflictWarning,
+    SpecJSONDecoder,
+    UnsafePatternWarning,
+    ValidatedDict,
+    ValidationTimeoutError,
+    analyze_pattern,
+    compile_spec,
+    convert_value,
+    custom_spec,
+    disable_checker_cache,
     dsv_feature,
+    enable_checker_cache,
+    freeze_adaptive_order,
+    freeze_specs,
+    get_adaptive_order,
+    get_compiled_config,
+    iter_validated_rows,
     not_,
+    parse_data_spec,
+    raise_if,
     reset_msg_level,
     validate_data_spec,
+    validate_json_patch,
 )
-from data_spec_validator.spec.validators import BaseValidator
+from data_spec_validator.spec.checks import clear_resolved_validators
+from data_spec_validator.spec.regex_guard import regex_guard
+from data_spec_validator.spec.validators import BaseValidator, RegexValidator
 
 from .utils import is_something_error, is_type_error
 
@@ -769,6 +805,62 @@ class TestSpec(unittest.TestCase):
         nok_data = dict(re_field='watch out, it is close!')
         assert is_something_error(ValueError, validate_data_spec, nok_data, FullmatchRegexSpec)
 
+    def test_regex_unsafe_pattern(self):
+        assert analyze_pattern(r'(a+)+$') == ['nested quantifier']
+        assert analyze_pattern(r'^(a|b|ab)*c$') == ['overlapping alternation']
+        assert analyze_pattern(r'^[\w.+-]+@[\w-]+\.[\w.-]+$') == []
+        assert analyze_pattern(r'(\d+-)+') == []
+
+        with self.assertWarns(UnsafePatternWarning) as cm:
+            Checker([REGEX], REGEX=dict(pattern=r'^(\w+\s?)*$'))
+        # The warning points to where the Checker is built.
+        assert cm.filename == __file__
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            Checker([REGEX], REGEX=dict(pattern=r'^(\w+\s?)*$', timeout=1))
+            Checker([REGEX], REGEX=dict(pattern=r'^\w+(\s\w+)*$'))
+
+        with self.assertRaises(TypeError):
+            Checker([REGEX], REGEX=dict(pattern=r'^a', timeout=0))
+        with self.assertRaises(TypeError):
+            Checker([REGEX], REGEX=dict(pattern=r'^a', max_length='1'))
+
+    def test_regex_guarded(self):
+        class LengthCappedSpec:
+            re_field = Checker([REGEX], REGEX=dict(pattern=r'^\d+$', max_length=3))
+
+        assert validate_data_spec(dict(re_field='123'), LengthCappedSpec)
+        assert is_something_error(ValueError, validate_data_spec, dict(re_field='1234'), LengthCappedSpec)
+
+        class GuardedSpec:
+            re_field = Checker([REGEX], REGEX=dict(pattern=r'^(a+)+$', method='match', timeout=1))
+
+        assert validate_data_spec(dict(re_field='aaa'), GuardedSpec)
+        assert is_something_error(ValueError, validate_data_spec, dict(re_field='aab'), GuardedSpec)
+
+        # Exponential on the backtracking engine, the matching is abandoned after the timeout
+        start = time.monotonic()
+        with self.assertRaises(ValueError) as ctx:
+            validate_data_spec(dict(re_field='a' * 64 + 'b'), GuardedSpec)
+        assert 'timeout' in str(ctx.exception)
+        assert time.monotonic() - start < 10
+
+        # The worker is replaced after the timeout
+        assert validate_data_spec(dict(re_field='aaa'), GuardedSpec)
+
+    def test_regex_guarded_concurrently(self):
+        # A matching of another thread on the workers killed by a timeout is submitted again instead of failing.
+        results = []
+        legit = threading.Thread(
+            target=lambda: results.append(regex_guard.match('match', r'(x+x+)+y', 'x' * 23, timeout=30))
+        )
+        regex_guard.match('match', '^a$', 'a', timeout=30)
+        legit.start()
+        with self.assertRaises(TimeoutError):
+            regex_guard.match('match', r'(x+x+)+y', 'x' * 64, timeout=0.1)
+        legit.join()
+        assert results == [False]
+
     def test_uuid(self):
         class UuidSpec:
             uuid_field = Checker([UUID])
@@ -906,6 +998,25 @@ class TestSpec(unittest.TestCase):
         assert is_something_error(LookupError, validate_data_spec, dict(d=1), _AnyKeysSetSpec)
         assert is_something_error(LookupError, validate_data_spec, dict(e=1), _AnyKeysSetSpec)
 
+        # The groups are checked, and reported, in a stable order
+        with self.assertRaises(KeyError) as ctx:
+            validate_data_spec(dict(e=1), _AnyKeysSetSpec)
+        assert 'a, b' in str(ctx.exception)
+
+    def test_strict_mode_with_alias(self):
+        @dsv_feature(strict=True)
+        class _StrictAliasSpec:
+            a = Checker([INT], alias='alias_a')
+            b = Checker([INT], optional=True)
+
+        assert validate_data_spec(dict(alias_a=1, b=1), _StrictAliasSpec)
+        assert is_something_error(ValueError, validate_data_spec, dict(a=1, alias_a=1), _StrictAliasSpec)
+
+        # The unexpected keys are reported in the payload order
+        with self.assertRaises(ValueError) as ctx:
+            validate_data_spec(dict(z=1, alias_a=1, y=1, x=1), _StrictAliasSpec)
+        assert "['z', 'y', 'x']" in str(ctx.exception)
+
     def test_err_mode(self):
         @dsv_feature(err_mode=ErrorMode.ALL)
         class _ErrModeAllSpec:
@@ -1103,6 +1214,58 @@ class TestSpec(unittest.TestCase):
         assert is_something_error(LookupError, validate_data_spec, dict(c=1), _CondExistABCSpec)
         assert is_something_error(LookupError, validate_data_spec, dict(d=1), _CondExistABCSpec)
 
+    def test_conditional_existence_violations(self):
+        class _CondExistFilterSpec:
+            a = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITH=['b', 'c', 'd'], WITHOUT=['e', 'f']))
+            b = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITH=['a']))
+            c = Checker([INT], optional=True)
+            d = Checker([INT], optional=True)
+            e = Checker([INT], optional=True)
+            f = Checker([INT], optional=True, alias='ff')
+
+        assert validate_data_spec(dict(a=1, b=1, c=1, d=1, ff=1), _CondExistFilterSpec)
+
+        # Every violated relation is reported
+        with self.assertRaises(KeyError) as ctx:
+            validate_data_spec(dict(a=1, b=1, c=1, e=1, f=1), _CondExistFilterSpec)
+        assert 'd must exist; e, f must not exist' in str(ctx.exception)
+
+    def test_conditional_existence_conflicts(self):
+        with self.assertWarns(SpecConflictWarning) as ctx:
+
+            class _CyclicConflictSpec:
+                a = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITH=['b']))
+                b = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITH=['c']))
+                c = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITHOUT=['a']))
+
+            compile_spec(_CyclicConflictSpec)
+        assert 'a can never be present' in str(ctx.warning)
+
+        with self.assertWarns(SpecConflictWarning):
+
+            class _RequiredConflictSpec:
+                a = Checker([COND_EXIST], COND_EXIST=dict(WITHOUT=['b']))
+                b = Checker([INT])
+
+            compile_spec(_RequiredConflictSpec)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+
+            # All-or-none & either-or groups are fine
+            class _GroupsSpec:
+                a = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITH=['b']))
+                b = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITH=['a'], WITHOUT=['c']))
+                c = Checker([COND_EXIST], optional=True, COND_EXIST=dict(WITHOUT=['b']))
+
+            compile_spec(_GroupsSpec)
+            assert validate_data_spec(dict(a=1, b=1), _GroupsSpec)
+            assert validate_data_spec(dict(c=1), _GroupsSpec)
+            assert is_something_error(KeyError, validate_data_spec, dict(a=1), _GroupsSpec)
+
+        with self.assertRaises(TypeError):
+            Checker([COND_EXIST], COND_EXIST=dict(WITH='a'))
+
     def test_optional_conditional_existence_other_check_fail(self):
         """
         The existence cases of a, b, c. 2 * 2 * 2 = 8 cases.
@@ -1251,6 +1414,46 @@ class TestSpec(unittest.TestCase):
         }
         assert is_something_error(LookupError, validate_data_spec, nok_data, AliasSpec)
 
+    def test_union(self):
+        class ClickSpec:
+            kind = Checker([ONE_OF], ONE_OF=['click'])
+            x = Checker([INT])
+            y = Checker([INT])
+
+        class KeySpec:
+            kind = Checker([ONE_OF], ONE_OF=['key'])
+            key = Checker([STR])
+
+        class EventSpec:
+            event = Checker([UNION], UNION=dict(tag='kind', specs={'click': ClickSpec, 'key': KeySpec}))
+            events = Checker(
+                [LIST_OF],
+                optional=True,
+                LIST_OF=UNION,
+                UNION=dict(tag='kind', specs={'click': ClickSpec, 'key': KeySpec}),
+            )
+
+        assert validate_data_spec(dict(event=dict(kind='click', x=1, y=2)), EventSpec)
+        assert validate_data_spec(dict(event=dict(kind='key', key='a')), EventSpec)
+        assert validate_data_spec(
+            dict(event=dict(kind='key', key='a'), events=[dict(kind='click', x=1, y=2), dict(kind='key', key='b')]),
+            EventSpec,
+        )
+
+        # Only the branch picked by the tag is validated
+        with self.assertRaises(TypeError) as ctx:
+            validate_data_spec(dict(event=dict(kind='key', key=1)), EventSpec)
+        assert 'KeySpec.key' in str(ctx.exception)
+        assert is_something_error(LookupError, validate_data_spec, dict(event=dict(kind='click', x=1)), EventSpec)
+        assert is_something_error(
+            LookupError, validate_data_spec, dict(event=dict(kind='key', key='a'), events=[dict(kind='key')]), EventSpec
+        )
+
+        assert is_something_error(ValueError, validate_data_spec, dict(event=dict(kind='scroll')), EventSpec)
+        assert is_something_error(ValueError, validate_data_spec, dict(event=dict(kind=['click'])), EventSpec)
+        assert is_something_error(LookupError, validate_data_spec, dict(event=dict(x=1, y=2)), EventSpec)
+        assert is_something_error(TypeError, validate_data_spec, dict(event=[]), EventSpec)
+
 
 class TestCustomSpec(unittest.TestCase):
     def test_incorrect_validator_class(self):
@@ -1313,6 +1516,47 @@ class TestCustomSpec(unittest.TestCase):
         nok_data = dict(key=10)
         assert is_something_error(ValueError, validate_data_spec, nok_data, GreaterThanSpec)
 
+    def test_custom_validator_shared_conversion(self):
+        converted = []
+
+        def _to_float(value):
+            converted.append(value)
+            return float(value)
+
+        class PositiveValidator(BaseValidator):
+            name = 'positive'
+
+            @staticmethod
+            def validate(value, extra, data):
+                return convert_value(value, extra, _to_float) > 0, ValueError(f'{value} is not positive')
+
+        class SmallValidator(BaseValidator):
+            name = 'small'
+
+            @staticmethod
+            def validate(value, extra, data):
+                return convert_value(value, extra, _to_float) < 10, ValueError(f'{value} is not small')
+
+        from data_spec_validator.spec import custom_spec
+
+        custom_spec.register(dict(positive=PositiveValidator(), small=SmallValidator()))
+
+        class SharedConversionSpec:
+            a = Checker(['positive', 'small'])
+            b = Checker(['positive', 'small'])
+            c = Checker([LIST_OF], LIST_OF='positive')
+
+        assert validate_data_spec(dict(a='1.5', b='2.5', c=['3', '4']), SharedConversionSpec)
+        assert converted == ['1.5', '2.5', '3', '4']
+
+        # The exception is shared as well
+        converted.clear()
+        assert is_something_error(RuntimeError, validate_data_spec, dict(a='x', b='1', c=[]), SharedConversionSpec)
+        assert converted == ['x', '1']
+
+        # Without a validation context, the value is simply converted
+        assert convert_value('1', {}, _to_float) == 1.0
+
 
 class TestCheckKeyword(unittest.TestCase):
     def test_check_keyword_must_upper_case(self):
@@ -1335,6 +1579,101 @@ class TestCheckKeyword(unittest.TestCase):
             Checker([ONE_OF], op=CheckerOP.ANY, OP='SOME_OP', ONE_OF=[1, 2], ALLOW_NONE=True)
         self.assertEqual('Forbidden keyword arguments: ALLOW_NONE, OP', str(cm.exception))
 
+    def test_invalid_check_configuration(self):
+        # The configurations are compiled, and the invalid ones are raised, when the Checker is built
+        with self.assertRaises(TypeError):
+            Checker([AMOUNT_RANGE], AMOUNT_RANGE=dict(lower=1))
+        with self.assertRaises(TypeError):
+            Checker([LENGTH], LENGTH=[1, 2])
+        with self.assertRaises(ValueError):
+            Checker([LENGTH], LENGTH=dict(min=-1))
+        with self.assertRaises(TypeError):
+            Checker([DATE_RANGE], DATE_RANGE=dict(min=date(2000, 1, 1)))
+        with self.assertRaises(ValueError):
+            Checker([DATE_RANGE], DATE_RANGE=dict(min='not a date'))
+        with self.assertRaises(TypeError):
+            Checker([UNION], UNION=dict(tag='kind'))
+        with self.assertRaises(ValueError):
+            Checker([REGEX], REGEX=dict(pattern='a', method='scan'))
+        # Also for the checks applied to the elements
+        with self.assertRaises(TypeError):
+            Checker([LIST_OF], LIST_OF=LENGTH, LENGTH=3)
+        with self.assertRaises(TypeError):
+            Checker([STR], source='query')
+        # Also for the listed checks missing their configurations
+        with self.assertRaises(TypeError):
+            Checker([AMOUNT_RANGE])
+        with self.assertRaises(TypeError):
+            Checker([STR, LENGTH])
+        with self.assertRaises(TypeError):
+            Checker([f'not-{DATE_RANGE}'])
+
+    def test_missing_configuration_compiled_once(self):
+        class _RegexSpec:
+            a = Checker([REGEX])
+
+        with patch.object(RegexValidator, 'compile_config', wraps=RegexValidator.compile_config) as compile_config:
+            for _ in range(3):
+                assert validate_data_spec(dict(a='any'), _RegexSpec)
+        compile_config.assert_not_called()
+
+    def test_custom_compile_config(self):
+        class BetweenValidator(BaseValidator):
+            name = 'between'
+
+            @staticmethod
+            def compile_config(config):
+                raise_if(type(config) != str or '~' not in config, TypeError(f'Invalid BETWEEN={config!r}'))
+                return tuple(int(bound) for bound in config.split('~'))
+
+            @staticmethod
+            def validate(value, extra, data):
+                lower, upper = get_compiled_config(extra, BetweenValidator)
+                return lower <= value <= upper, ValueError(f'{value} is not between {lower} and {upper}')
+
+        from data_spec_validator.spec import custom_spec
+
+        custom_spec.register(dict(between=BetweenValidator()))
+
+        class BetweenSpec:
+            a = Checker(['between'], BETWEEN='1~3')
+
+        assert BetweenSpec.a.extra['between'] == '1~3'
+        assert validate_data_spec(dict(a=2), BetweenSpec)
+        assert is_something_error(ValueError, validate_data_spec, dict(a=4), BetweenSpec)
+        with self.assertRaises(TypeError):
+            Checker(['between'], BETWEEN='1')
+
+    def test_identical_checkers_shared(self):
+        # The Checkers are immutable, the identical ones are the same object.
+        checker = Checker([LIST_OF], optional=True, LIST_OF=STR)
+        assert checker is Checker([LIST_OF], optional=True, LIST_OF=STR)
+        assert checker is not Checker([LIST_OF], LIST_OF=STR)
+        assert checker.checks == (LIST_OF,)
+        assert copy.deepcopy(checker) is checker
+        with self.assertRaises(TypeError):
+            checker.extra[LIST_OF] = INT
+        with self.assertRaises(AttributeError):
+            checker.other = 1
+
+        # The values equal but of different types are not the same configuration, e.g. in the messages.
+        assert Checker([ONE_OF], ONE_OF=[1]) is not Checker([ONE_OF], ONE_OF=[True])
+        assert Checker([ONE_OF], ONE_OF=[1]) is not Checker([ONE_OF], ONE_OF=(1,))
+        assert Checker([ONE_OF], ONE_OF=[0.0]) is not Checker([ONE_OF], ONE_OF=[-0.0])
+        assert Checker([ONE_OF], ONE_OF=[1]) is not Checker([ONE_OF], ONE_OF=[1.0])
+        assert Checker([STR], optional=1) is not Checker([STR], optional=True)
+
+        # So are the configurations of classes, compared by identity.
+        class _ItemSpec:
+            name = Checker([STR])
+
+        assert Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec) is Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+        assert Checker([ONE_OF], ONE_OF=[Source.QUERY]) is Checker([ONE_OF], ONE_OF=[Source.QUERY])
+
+        # The configurations which can't be keyed, e.g. a compiled pattern, are not shared.
+        pattern = re.compile('^a$')
+        assert Checker([REGEX], REGEX=dict(pattern=pattern)) is not Checker([REGEX], REGEX=dict(pattern=pattern))
+
 
 class TestMessageLevel(unittest.TestCase):
     def test_vague_message(self):
@@ -1379,5 +1718,697 @@ class TestMultipleRowSpec(unittest.TestCase):
         assert 'SingleRowSpec' in str(ctx.exception)
 
 
+class TestParseDataSpec(unittest.TestCase):
+    def test_parsed_values(self):
+        class _ItemSpec:
+            price = Checker([AMOUNT])
+
+        class _ParseSpec:
+            day = Checker([DATE])
+            amount = Checker([AMOUNT, AMOUNT_RANGE], AMOUNT_RANGE=dict(min=0))
+            ratio = Checker([DECIMAL_PLACE], DECIMAL_PLACE=2)
+            uid = Checker([UUID])
+            payload = Checker([JSON])
+            count = Checker([INT, DIGIT_STR], op=CheckerOP.ANY)
+            name = Checker([STR], alias='user_name')
+            note = Checker([STR], optional=True)
+            memo = Checker([STR], allow_none=True)
+            items = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+            days = Checker([FOREACH], FOREACH=DATE)
+
+        data = dict(
+            day='2023-01-02',
+            amount='10.50',
+            ratio=1.25,
+            uid='92d88ec0-a1f2-439a-b3c0-9e36db8b0b75',
+            payload='{"a": [1]}',
+            count='42',
+            user_name='dsv',
+            memo=None,
+            items=[dict(price='1.1', extra_key=1)],
+            days=('2023-01-03',),
+            unknown='x',
+        )
+        assert parse_data_spec(data, _ParseSpec) == dict(
+            day=date(2023, 1, 2),
+            amount=Decimal('10.50'),
+            ratio=Decimal('1.25'),
+            uid=uuid.UUID('92d88ec0-a1f2-439a-b3c0-9e36db8b0b75'),
+            payload={'a': [1]},
+            count=42,
+            name='dsv',
+            memo=None,
+            items=[dict(price=Decimal('1.1'))],
+            days=[date(2023, 1, 3)],
+        )
+
+        assert is_something_error(ValueError, parse_data_spec, dict(data, day='not a date'), _ParseSpec)
+        assert parse_data_spec(dict(data, day='not a date'), _ParseSpec, nothrow=True) is None
+
+    def test_parsed_as_validated(self):
+        # The values accepted by the validation are parsed from what was accepted.
+        class _AmountSpec:
+            a = Checker([AMOUNT])
+
+        class _DigitSpec:
+            a = Checker([DIGIT_STR])
+
+        assert validate_data_spec(dict(a=True), _AmountSpec)
+        assert parse_data_spec(dict(a=True), _AmountSpec) == dict(a=Decimal('1'))
+        assert parse_data_spec(dict(a=b'2.5'), _AmountSpec) == dict(a=Decimal('2.5'))
+        assert validate_data_spec(dict(a='²'), _DigitSpec)
+        assert parse_data_spec(dict(a='²'), _DigitSpec) == dict(a=2)
+        assert parse_data_spec(dict(a='1²'), _DigitSpec) == dict(a=12)
+
+    def test_first_converting_check_decides(self):
+        # The checks run in the declared order, regardless of the hash seed.
+        class _IntFirstSpec:
+            a = Checker([DIGIT_STR, AMOUNT])
+
+        class _AmountFirstSpec:
+            a = Checker([AMOUNT, DIGIT_STR])
+
+        parsed = parse_data_spec(dict(a='12'), _IntFirstSpec)
+        assert parsed == dict(a=12) and type(parsed['a']) is int
+        parsed = parse_data_spec(dict(a='12'), _AmountFirstSpec)
+        assert parsed == dict(a=Decimal('12')) and type(parsed['a']) is Decimal
+
+        # Nor are they reordered by the adaptive ordering, e.g. running AMOUNT first once it looks cheaper.
+        for op in (CheckerOP.ALL, CheckerOP.ANY):
+
+            @dsv_feature(adaptive=True)
+            class _AdaptiveSpec:
+                a = Checker([DIGIT_STR, AMOUNT], op=op)
+
+            freeze_adaptive_order(_AdaptiveSpec, [('a', (AMOUNT, DIGIT_STR))])
+            parsed = parse_data_spec(dict(a='12'), _AdaptiveSpec)
+            assert parsed == dict(a=12) and type(parsed['a']) is int
+
+    def test_parsed_rows(self):
+        class _RowSpec:
+            day = Checker([DATE])
+
+        rows = [dict(day='2023-01-02'), dict(day='2023-01-03')]
+        assert parse_data_spec(rows, _RowSpec, multirow=True) == [
+            dict(day=date(2023, 1, 2)),
+            dict(day=date(2023, 1, 3)),
+        ]
+
+    def test_custom_normalize(self):
+        class _UpperValidator(BaseValidator):
+            name = 'upper_str'
+
+            @staticmethod
+            def validate(value, extra, data):
+                return type(value) == str, TypeError(f'{repr(value)} is not a string')
+
+            @staticmethod
+            def normalize(value, extra):
+                return value.upper()
+
+        from data_spec_validator.spec import custom_spec
+
+        custom_spec.register(dict(upper_str=_UpperValidator()))
+
+        class _UpperSpec:
+            code = Checker(['upper_str', LENGTH], LENGTH=dict(max=3))
+
+        assert parse_data_spec(dict(code='abc'), _UpperSpec) == dict(code='ABC')
+
+
+class TestPartialValidation(unittest.TestCase):
+    def test_partial_fields(self):
+        class _NestedSpec:
+            a = Checker([INT])
+            b = Checker([INT])
+
+        @dsv_feature(strict=True, any_keys_set={('name', 'nick')})
+        class _PatchSpec:
+            name = Checker([STR], alias='user_name')
+            nick = Checker([STR])
+            age = Checker([INT])
+            nested = Checker([SPEC], SPEC=_NestedSpec)
+            email = Checker([EMAIL, COND_EXIST], COND_EXIST=dict(WITH=['age']))
+
+        assert validate_data_spec(dict(age=1), _PatchSpec, partial=True)
+        assert validate_data_spec(dict(user_name='dsv'), _PatchSpec, partial=True)
+        assert validate_data_spec({}, _PatchSpec, partial=True)
+        assert is_something_error(LookupError, validate_data_spec, dict(age=1), _PatchSpec)
+
+        # The present fields are validated as usual, including the nested specs, which are validated entirely.
+        assert is_something_error(TypeError, validate_data_spec, dict(age='1'), _PatchSpec, partial=True)
+        assert is_something_error(TypeError, validate_data_spec, dict(user_name=1), _PatchSpec, partial=True)
+        assert is_something_error(LookupError, validate_data_spec, dict(nested=dict(a=1)), _PatchSpec, partial=True)
+        assert is_something_error(KeyError, validate_data_spec, dict(email='a@b.cd'), _PatchSpec, partial=True)
+        assert validate_data_spec(dict(email='a@b.cd', age=1), _PatchSpec, partial=True)
+
+        # The unexpected keys are still rejected in strict mode.
+        assert is_something_error(ValueError, validate_data_spec, dict(name='dsv'), _PatchSpec, partial=True)
+
+    def test_partial_parse(self):
+        class _PatchSpec:
+            day = Checker([DATE])
+            amount = Checker([AMOUNT])
+
+        assert parse_data_spec(dict(amount='1.5'), _PatchSpec, partial=True) == dict(amount=Decimal('1.5'))
+
+        rows = [dict(day='2023-01-02'), dict(amount='2')]
+        assert parse_data_spec(rows, _PatchSpec, multirow=True, partial=True) == [
+            dict(day=date(2023, 1, 2)),
+            dict(amount=Decimal('2')),
+        ]
+        assert is_something_error(
+            ValueError, validate_data_spec, [dict(amount='x')], _PatchSpec, multirow=True, partial=True
+        )
+
+
+class TestJsonPatchValidation(unittest.TestCase):
+    def test_patched_fields(self):
+        class _ItemSpec:
+            price = Checker([AMOUNT])
+            qty = Checker([INT], optional=True)
+
+        @dsv_feature(strict=True)
+        class _MetaSpec:
+            tag = Checker([STR])
+
+        class _DocSpec:
+            title = Checker([STR])
+            email = Checker([EMAIL, COND_EXIST], optional=True, COND_EXIST=dict(WITH=['title']))
+            meta = Checker([SPEC], SPEC=_MetaSpec)
+            items = Checker([LIST_OF, LENGTH], LIST_OF=SPEC, SPEC=_ItemSpec, LENGTH=dict(max=2))
+
+        def _doc():
+            return dict(title='t', email='a@b.cd', meta=dict(tag='x'), items=[dict(price='1.0'), dict(price='2')])
+
+        doc = _doc()
+        doc['items'][1]['price'] = '3'
+        assert validate_json_patch(doc, _DocSpec, [dict(op='replace', path='/items/1/price', value='3')])
+
+        doc = _doc()
+        doc['items'][1]['qty'] = 'x'
+        patch = [dict(op='add', path='/items/1/qty', value='x')]
+        assert is_something_error(TypeError, validate_json_patch, doc, _DocSpec, patch)
+        assert validate_json_patch(doc, _DocSpec, patch, nothrow=True) is False
+
+        # The fields outside of the patch paths are not validated again.
+        doc = _doc()
+        doc['title'], doc['meta']['tag'] = 1, 'y'
+        assert validate_json_patch(doc, _DocSpec, [dict(op='replace', path='/meta/tag', value='y')])
+        assert validate_json_patch(doc, _DocSpec, [dict(op='test', path='', value={})])
+        assert is_something_error(
+            TypeError, validate_json_patch, doc, _DocSpec, [dict(op='replace', path='', value={})]
+        )
+
+        # The keys added to & removed from a dict validate the spec-wise checks as well.
+        doc = _doc()
+        doc['meta']['unknown'] = 1
+        patch = [dict(op='add', path='/meta/unknown', value=1)]
+        assert is_something_error(ValueError, validate_json_patch, doc, _DocSpec, patch)
+
+        doc = _doc()
+        del doc['title']
+        assert is_something_error(LookupError, validate_json_patch, doc, _DocSpec, [dict(op='remove', path='/title')])
+
+        doc = _doc()
+        doc['subject'] = doc.pop('title')
+        patch = [dict(op='move', **{'from': '/title'}, path='/subject')]
+        assert is_something_error(LookupError, validate_json_patch, doc, _DocSpec, patch)
+
+        # The elements added to a list validate the whole field.
+        doc = _doc()
+        doc['items'].append(dict(price='4'))
+        patch = [dict(op='add', path='/items/-', value=dict(price='4'))]
+        assert is_something_error(ValueError, validate_json_patch, doc, _DocSpec, patch)
+
+        assert is_something_error(ValueError, validate_json_patch, _doc(), _DocSpec, [dict(op='merge', path='/')])
+        assert is_something_error(ValueError, validate_json_patch, _doc(), _DocSpec, [dict(op='remove', path='x')])
+
+    def test_patched_rows(self):
+        class _RowSpec:
+            day = Checker([DATE])
+
+        rows = [dict(day='2023-01-02'), dict(day='bad')]
+        assert validate_json_patch(
+            rows, _RowSpec, [dict(op='replace', path='/0/day', value='2023-01-02')], multirow=True
+        )
+        patch = [dict(op='replace', path='/1', value=dict(day='bad'))]
+        assert is_something_error(ValueError, validate_json_patch, rows, _RowSpec, patch, multirow=True)
+        assert validate_json_patch(rows, _RowSpec, [dict(op='remove', path='/2')], multirow=True)
+
+        # A patched element which is not a dict fails as validate_data_spec does.
+        patch = [dict(op='replace', path='/0', value=1)]
+        assert validate_json_patch([1], _RowSpec, patch, multirow=True, nothrow=True) is False
+        assert is_something_error(ValueError, validate_json_patch, [1], _RowSpec, patch, multirow=True)
+
+    def test_patched_element_not_dict(self):
+        class _ItemSpec:
+            name = Checker([STR])
+
+        class _ListOfSpec:
+            items = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+
+        class _ForeachSpec:
+            items = Checker([LIST, FOREACH], FOREACH=SPEC, SPEC=_ItemSpec)
+
+        doc, patch = dict(items=[dict(name='a'), 1]), [dict(op='replace', path='/items/1', value=1)]
+        for spec, error in ((_ListOfSpec, TypeError), (_ForeachSpec, RuntimeError)):
+            assert validate_data_spec(doc, spec, nothrow=True) is False
+            assert validate_json_patch(doc, spec, patch, nothrow=True) is False
+            assert is_something_error(error, validate_data_spec, doc, spec)
+            assert is_something_error(error, validate_json_patch, doc, spec, patch)
+
+
+class TestValidatedDict(unittest.TestCase):
+    def test_revalidate_changed_keys(self):
+        @dsv_feature(strict=True)
+        class _RecordSpec:
+            name = Checker([STR])
+            age = Checker([INT], optional=True)
+            email = Checker([EMAIL, COND_EXIST], optional=True, COND_EXIST=dict(WITH=['age']))
+
+        assert is_something_error(TypeError, ValidatedDict, dict(name=1), _RecordSpec)
+
+        record = ValidatedDict(dict(name='dsv', age=1, email='a@b.cd'), _RecordSpec)
+        assert record == dict(name='dsv', age=1, email='a@b.cd') and isinstance(record, dict)
+        assert record.revalidate()
+
+        record['age'] = 2
+        record.update(name='DSV')
+        assert record.changed_keys == {'age', 'name'}
+        assert record.revalidate() and not record.changed_keys
+
+        record['name'] = 1
+        assert is_something_error(TypeError, record.revalidate)
+        assert record.revalidate(nothrow=True) is False
+        record['name'] = 'dsv'
+        assert record.revalidate()
+
+        # The COND_EXIST dependents of a deleted key are validated as well.
+        del record['age']
+        assert is_something_error(KeyError, record.revalidate)
+        record.pop('email')
+        assert record.revalidate()
+
+        record.setdefault('unknown', 1)
+        assert is_something_error(ValueError, record.revalidate)
+        record.clear()
+        assert is_something_error(LookupError, record.revalidate)
+
+    def test_mark_changed(self):
+        class _ItemSpec:
+            price = Checker([AMOUNT])
+
+        class _OrderSpec:
+            items = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+
+        order = ValidatedDict(dict(items=[dict(price='1')]), _OrderSpec)
+        order['items'].append(dict(price='x'))
+        assert order.revalidate()
+        order.mark_changed('items')
+        assert is_something_error(ValueError, order.revalidate)
+
+
+class TestSpecJSONDecoder(unittest.TestCase):
+    def test_decode_validated(self):
+        class _ItemSpec:
+            price = Checker([AMOUNT])
+
+        @dsv_feature(strict=True)
+        class _DocSpec:
+            title = Checker([STR])
+            meta = Checker([SPEC], SPEC=_ItemSpec, optional=True)
+            items = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+
+        doc = dict(title='t', meta=dict(price=1), items=[dict(price='1.5'), dict(price=2)])
+        assert json.loads(json.dumps(doc), cls=SpecJSONDecoder, spec=_DocSpec) == doc
+        assert json.loads(' { "title" : "t" , "items" : [ ] } ', cls=SpecJSONDecoder, spec=_DocSpec) == dict(
+            title='t', items=[]
+        )
+
+        for invalid_doc, error in [
+            (dict(doc, items=[dict(price='x')]), ValueError),
+            (dict(doc, items=[1]), TypeError),
+            (dict(doc, meta=[]), RuntimeError),
+            (dict(doc, title=1), TypeError),
+            (dict(items=[]), LookupError),
+        ]:
+            s = json.dumps(invalid_doc)
+            assert is_something_error(error, json.loads, s, cls=SpecJSONDecoder, spec=_DocSpec)
+            assert is_something_error(error, validate_data_spec, invalid_doc, _DocSpec)
+
+        # An invalid object is rejected before the rest of the document is decoded.
+        s = json.dumps(dict(items=[dict(price='x')]))[:-1] + ', "title": '
+        assert is_something_error(ValueError, json.loads, s, cls=SpecJSONDecoder, spec=_DocSpec)
+
+        # The value replaced by a duplicate key is validated again.
+        s = '{"title": "t", "items": [], "meta": {"price": 1}, "meta": 5}'
+        assert is_something_error(RuntimeError, json.loads, s, cls=SpecJSONDecoder, spec=_DocSpec)
+        s = '{"title": "t", "items": [], "meta": 5, "meta": {"price": "x"}}'
+        assert is_something_error(ValueError, json.loads, s, cls=SpecJSONDecoder, spec=_DocSpec)
+        assert not isinstance(self._catch(json.loads, s, cls=SpecJSONDecoder, spec=_DocSpec), json.JSONDecodeError)
+        for s in [
+            '{"title": "t", "items": []',
+            '{"title" "t"}',
+            '{"title": "t", "items": []} x',
+            '{"items": [{"price": 1}}',
+        ]:
+            assert is_something_error(json.JSONDecodeError, json.loads, s, cls=SpecJSONDecoder, spec=_DocSpec)
+
+    def test_decode_rows(self):
+        @dsv_feature(limits=dict(max_rows=2))
+        class _RowSpec:
+            day = Checker([DATE])
+
+        s = '[{"day": "2023-01-02"}, {"day": "2023-01-03"}]'
+        assert json.loads(s, cls=SpecJSONDecoder, spec=_RowSpec, multirow=True) == json.loads(s)
+        assert json.loads(s, cls=SpecJSONDecoder, spec=_RowSpec, multirow=None) == json.loads(s)
+        assert is_something_error(
+            ValueError, json.loads, '[{"day": "x"}]', cls=SpecJSONDecoder, spec=_RowSpec, multirow=True
+        )
+        assert is_something_error(ValueError, json.loads, '[1]', cls=SpecJSONDecoder, spec=_RowSpec, multirow=True)
+        assert is_something_error(
+            LimitExceededError, json.loads, s[:-1] + ', 1]', cls=SpecJSONDecoder, spec=_RowSpec, multirow=True
+        )
+
+    def test_decode_deeply_nested(self):
+        class _NodeSpec:
+            name = Checker([STR])
+            next = Checker([SPEC], optional=True, SPEC=SELF)
+            children = Checker([LIST_OF], optional=True, LIST_OF=SPEC, SPEC=SELF)
+
+        # Deeper than the recursion limit, like the validation the decoding doesn't grow the Python stack.
+        n = 2000
+        s = '{"name": "x", "next": ' * n + '{"name": "x", "children": [' * n + '{"name": "y"}' + ']}' * n + '}' * n
+        node, depth = json.loads(s, cls=SpecJSONDecoder, spec=_NodeSpec), 0
+        while 'next' in node:
+            node, depth = node['next'], depth + 1
+        assert depth == n
+        assert is_something_error(TypeError, json.loads, s.replace('"y"', '1'), cls=SpecJSONDecoder, spec=_NodeSpec)
+
+    @staticmethod
+    def _catch(func, *args, **kwargs):
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            return e
+
+
+class TestStreamValidation(unittest.TestCase):
+    class _RowSpec:
+        name = Checker([STR])
+        day = Checker([DATE], optional=True)
+
+    def test_iter_validated_rows(self):
+        rows = [dict(name='a "[{\\'), dict(name='ü', day='2023-01-02'), dict(name='c')]
+        body = json.dumps(rows, ensure_ascii=False, indent=2).encode()
+        for chunk_size in (1, 3, 1024):
+            assert list(iter_validated_rows(io.BytesIO(body), self._RowSpec, chunk_size=chunk_size)) == rows
+        assert list(iter_validated_rows([' [ ', ']'], self._RowSpec)) == []
+        assert list(iter_validated_rows([json.dumps(rows[1:2])], self._RowSpec, parse=True)) == [
+            dict(name='ü', day=date(2023, 1, 2))
+        ]
+
+    def test_reject_before_reading_the_rest(self):
+        chunks = iter([b'[{"name": "a"}, {"name": 1}', b', {"name": "c"}]'])
+        validated = iter_validated_rows(chunks, self._RowSpec)
+        assert next(validated) == dict(name='a')
+        assert is_something_error(TypeError, next, validated)
+        assert next(chunks) == b', {"name": "c"}]'
+
+        # The rows must be objects, as validate_data_spec(..., multirow=True) requires.
+        for body in ['[1]', '["x"]', '[{"name": "a"}, 2]', '[[{"name": "a"}]]']:
+            assert is_something_error(ValueError, list, iter_validated_rows([body], self._RowSpec))
+            assert is_something_error(ValueError, validate_data_spec, json.loads(body), self._RowSpec, multirow=True)
+
+        for body in ['{"name": "a"}', '[{"name": "a"} {"name": "b"}]', '[{"name": "a"}', '[{"name": "a"},]', '[] 1']:
+            assert is_something_error(json.JSONDecodeError, list, iter_validated_rows([body], self._RowSpec))
+
+    def test_decode_error_position(self):
+        # Reported in the whole body like json.loads does, wherever the chunks were split.
+        rows = ',\n'.join(json.dumps(dict(name=f'row {i}')) for i in range(20))
+        bodies = [f'[\n{rows},\n {{"name": tru}}\n]', f'[\n{rows}\n {{"name": "a"}}]', f'[\n{rows}\n] 1', '\n\n  x']
+        for body in bodies:
+            expected = self._catch(json.loads, body)
+            for chunk_size in (1, 7, 1024):
+                err = self._catch(list, iter_validated_rows(io.StringIO(body), self._RowSpec, chunk_size=chunk_size))
+                assert isinstance(err, json.JSONDecodeError)
+                assert (err.pos, err.lineno, err.colno) == (expected.pos, expected.lineno, expected.colno)
+
+    @staticmethod
+    def _catch(func, *args, **kwargs):
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            return e
+
+    def test_stream_limits(self):
+        body = json.dumps([dict(name='a' * 10)] * 3)
+        assert is_something_error(LimitExceededError, list, iter_validated_rows([body], self._RowSpec, max_rows=2))
+        assert is_something_error(
+            LimitExceededError, list, iter_validated_rows([body], self._RowSpec, max_body_size=len(body) - 1)
+        )
+        assert is_something_error(LimitExceededError, list, iter_validated_rows([body], self._RowSpec, max_row_size=10))
+        assert is_something_error(LimitExceededError, list, iter_validated_rows([body], self._RowSpec, max_str_size=5))
+        assert len(list(iter_validated_rows([body], self._RowSpec, max_rows=3, max_row_size=22))) == 3
+
+
+class TestFreezeSpecs(unittest.TestCase):
+    def tearDown(self):
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+    def test_freeze_specs(self):
+        class _NestedSpec:
+            b = Checker([REGEX], REGEX=dict(pattern=r'^b+$'))
+
+        class _Spec:
+            a = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_NestedSpec)
+
+        report = freeze_specs(_Spec)
+        assert '__dsv_plan__' in vars(_NestedSpec)
+        assert report.specs >= 2
+        assert report.spec_bytes > 0
+        if hasattr(gc, 'freeze'):
+            assert report.frozen_objects > 0
+        assert validate_data_spec(dict(a=[dict(b='bb')]), _Spec)
+
+
+class TestCheckerCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = os.path.join(tempfile.mkdtemp(), 'checkers.pickle')
+
+    def tearDown(self):
+        disable_checker_cache()
+
+    def _enable(self):
+        # Like a new process, the Checkers built already are not shared.
+        clear_resolved_validators()
+        return enable_checker_cache(self.cache_path, save_at_exit=False)
+
+    def test_checkers_loaded_from_disk(self):
+        class _ItemSpec:
+            name = Checker([STR])
+
+        def _build_checkers():
+            return [
+                Checker([STR], optional=True, alias='A'),
+                Checker([REGEX], REGEX=dict(pattern='^a+$')),
+                Checker([LENGTH, STR], LENGTH=dict(min=1, max=2), source=Source.QUERY),
+                Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec),
+            ]
+
+        cache = self._enable()
+        built = _build_checkers()
+        assert cache.save() == 3
+        assert cache.save() == 0
+
+        self._enable()
+        with patch.object(Checker, '_build', autospec=True, side_effect=Checker._build) as build:
+            checkers = _build_checkers()
+        # The Checker of a class is built every time.
+        assert build.call_count == 1
+        for checker, built_checker in zip(checkers, built):
+            assert checker is not built_checker
+            assert checker.checks == built_checker.checks and checker.extra == built_checker.extra
+            assert (checker.allow_optional, checker.alias, checker.source) == (
+                built_checker.allow_optional,
+                built_checker.alias,
+                built_checker.source,
+            )
+
+        class _Spec:
+            a = checkers[1]
+            b = checkers[2]
+
+        assert validate_data_spec(dict(a='aa', b='b'), _Spec)
+        assert is_something_error(ValueError, validate_data_spec, dict(a='ab', b='b'), _Spec)
+        assert is_something_error(ValueError, validate_data_spec, dict(a='aa', b='bbb'), _Spec)
+
+    def test_checkers_invalidated(self):
+        cache = self._enable()
+        Checker([STR], alias='cached')
+        assert cache.save() == 1
+
+        with patch('data_spec_validator.spec.checker_cache.__version__', '0.0.0'):
+            cache = self._enable()
+            with patch.object(Checker, '_build', autospec=True, side_effect=Checker._build) as build:
+                Checker([STR], alias='cached')
+        build.assert_called_once()
+        assert cache.save() == 1
+
+        # The extra of a Checker depends on the custom checks registered.
+        class _CachedCheckValidator(BaseValidator):
+            name = 'cached_check'
+
+            @staticmethod
+            def validate(value, extra, data):
+                return True, ''
+
+        self._enable()
+        custom_spec.register(dict(cached_check=_CachedCheckValidator()))
+        with patch.object(Checker, '_build', autospec=True, side_effect=Checker._build) as build:
+            Checker([STR], alias='cached')
+        build.assert_called_once()
+
+
+class TestPayloadLimits(unittest.TestCase):
+    @staticmethod
+    def _get_spec(limits=None):
+        class _ItemSpec:
+            name = Checker([STR])
+
+        @dsv_feature(limits=limits)
+        class _Spec:
+            items = Checker([LIST_OF], LIST_OF=SPEC, SPEC=_ItemSpec)
+            tags = Checker([FOREACH], optional=True, FOREACH=STR)
+
+        return _Spec
+
+    def test_max_rows(self):
+        spec = self._get_spec()
+        rows = [dict(items=[])] * 3
+        assert validate_data_spec(rows, spec, multirow=True, max_rows=3)
+        assert is_something_error(LimitExceededError, validate_data_spec, rows, spec, multirow=True, max_rows=2)
+        assert not validate_data_spec(rows, spec, multirow=True, max_rows=2, nothrow=True)
+
+        # The rows of unknown size are counted during the validation
+        assert validate_data_spec(iter(rows), spec, multirow=True, max_rows=3)
+        assert is_something_error(LimitExceededError, validate_data_spec, iter(rows), spec, multirow=True, max_rows=2)
+
+        # The rows are not limited by max_list_length
+        assert validate_data_spec(rows, spec, multirow=True, max_list_length=1)
+
+    def test_max_list_length(self):
+        spec = self._get_spec()
+        data = dict(items=[dict(name='a'), dict(name='b')], tags=(t for t in ['a', 'b']))
+        assert validate_data_spec(data, spec, max_list_length=2)
+
+        data = dict(items=[dict(name='a'), dict(name='b')])
+        with self.assertRaises(LimitExceededError) as ctx:
+            validate_data_spec(data, spec, max_list_length=1)
+        assert '_Spec.items' in str(ctx.exception)
+
+        data = dict(items=[], tags=(t for t in ['a', 'b']))
+        assert is_something_error(LimitExceededError, validate_data_spec, data, spec, max_list_length=1)
+
+    def test_max_str_size(self):
+        spec = self._get_spec()
+        assert validate_data_spec(dict(items=[dict(name='abc')], tags=['abc']), spec, max_str_size=3)
+        assert is_something_error(
+            LimitExceededError, validate_data_spec, dict(items=[dict(name='abcd')]), spec, max_str_size=3
+        )
+        assert is_something_error(
+            LimitExceededError, validate_data_spec, dict(items=[], tags=['abcd']), spec, max_str_size=3
+        )
+
+    def test_spec_limits(self):
+        spec = self._get_spec(dict(max_list_length=1, max_depth=1))
+        data = dict(items=[dict(name='a'), dict(name='b')])
+        assert is_something_error(LimitExceededError, validate_data_spec, data, spec)
+        # The limits of validate_data_spec take precedence
+        assert is_something_error(LimitExceededError, validate_data_spec, data, spec, max_list_length=None)
+        assert validate_data_spec(data, spec, max_list_length=None, max_depth=None)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(TypeError):
+            self._get_spec(dict(max_size=1))
+        with self.assertRaises(TypeError):
+            self._get_spec(dict(max_rows=-1))
+        with self.assertRaises(TypeError):
+            validate_data_spec(dict(items=[]), self._get_spec(), max_rows='1')
+        with self.assertRaises(TypeError):
+            self._get_spec(dict(deadline=0))
+
+    def test_deadline(self):
+        def _slow_tags(n):
+            for _ in range(n):
+                time.sleep(0.02)
+                yield 'tag'
+
+        spec = self._get_spec()
+        assert validate_data_spec(dict(items=[], tags=_slow_tags(3)), spec, deadline=10)
+        with self.assertRaises(ValidationTimeoutError) as ctx:
+            validate_data_spec(dict(items=[], tags=_slow_tags(3)), spec, deadline=0.01)
+        assert 'deadline' in str(ctx.exception)
+        assert not validate_data_spec(dict(items=[], tags=_slow_tags(3)), spec, deadline=0.01, nothrow=True)
+
+        # The clock is also checked between the rows
+        rows = [dict(items=[], tags=_slow_tags(1))] * 3
+        assert is_something_error(ValidationTimeoutError, validate_data_spec, rows, spec, multirow=True, deadline=0.01)
+
+        spec = self._get_spec(dict(deadline=0.01))
+        assert is_something_error(ValidationTimeoutError, validate_data_spec, dict(items=[], tags=_slow_tags(3)), spec)
+
+
+class TestAdaptiveFeature(unittest.TestCase):
+    def test_learned_order_prefers_failing_fields(self):
+        @dsv_feature(adaptive=True)
+        class _AdaptiveSpec:
+            a = Checker([INT])
+            b = Checker([STR])
+            c = Checker([DIGIT_STR, INT], op=CheckerOP.ANY)
+
+        for _ in range(200):
+            assert validate_data_spec(dict(a=1, b='b', c=3), _AdaptiveSpec)
+        # Under CheckerOP.ANY, the passing check goes first
+        assert dict(get_adaptive_order(_AdaptiveSpec))['c'][0] == INT
+
+        for _ in range(200):
+            assert is_something_error(TypeError, validate_data_spec, dict(a=1, b=2, c=3), _AdaptiveSpec)
+        assert get_adaptive_order(_AdaptiveSpec)[0][0] == 'b'
+
+    def test_freeze_order(self):
+        @dsv_feature(adaptive=True)
+        class _AdaptiveSpec:
+            a = Checker([INT])
+            b = Checker([STR])
+
+        freeze_adaptive_order(_AdaptiveSpec, [('b', ()), ('a', ())])
+        for _ in range(200):
+            assert is_something_error(TypeError, validate_data_spec, dict(a='1', b='b'), _AdaptiveSpec)
+        assert get_adaptive_order(_AdaptiveSpec) == [('b', ()), ('a', ())]
+
+    def test_stop_at_first_failure(self):
+        @dsv_feature(adaptive=True)
+        class _AdaptiveSpec:
+            a = Checker([INT])
+            b = Checker([STR])
+
+        with self.assertRaises(TypeError) as ctx:
+            validate_data_spec(dict(a='1', b=2), _AdaptiveSpec)
+        assert '_AdaptiveSpec.a' in str(ctx.exception)
+
+    def test_invalid_usage(self):
+        with self.assertRaises(ValueError):
+            dsv_feature(adaptive=True, err_mode=ErrorMode.ALL)(type('_Spec', (), {}))
+
+        class _NonAdaptiveSpec:
+            a = Checker([INT])
+
+        with self.assertRaises(TypeError):
+            get_adaptive_order(_NonAdaptiveSpec)
+
+
 if __name__ == '__main__':
     unittest.main()